@@ -1,57 +1,197 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 import os
 import json
-import glob
+import hashlib
+from datetime import date
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
 from fastapi import HTTPException
+from utils.jobQueue import get_job, list_jobs
+from utils.reportStore import get_report_store, needs_results, project_report
+from utils.reportRenderer import RenderCache
 
+# Responses smaller than this are not worth compressing
+GZIP_MIN_BYTES = int(os.getenv("API_GZIP_MIN_BYTES", "1024"))
 
 app = FastAPI()
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_BYTES)
+
+store = get_report_store()
+text_reports = RenderCache()
+
+
+def _not_modified(request, etag, mtime=None):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and mtime is not None:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _json_bytes_response(request, render, etag, mtime=None, media_type="application/json"):
+    # render() builds the body; it is not called when the client's copy is current
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if mtime is not None:
+        headers["Last-Modified"] = formatdate(mtime, usegmt=True)
+    if _not_modified(request, etag, mtime):
+        return Response(status_code=304, headers=headers)
+    return Response(content=render(), media_type=media_type, headers=headers)
+
+
+def _parse_fields(fields):
+    return [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+
+
+def _report_column(fields, compact):
+    # The slim view covers everything except results; only load the full
+    # report when it is asked for whole or the projection needs results
+    if not fields and not compact:
+        return "candidate_report"
+    return "candidate_report" if fields and not compact and needs_results(fields) else "slim"
+
+
+def _render_report(row, column, fields, wrap=None):
+    if column == "candidate_report" and not fields:
+        body = row[column].encode()  # stored bytes, served without parsing
+    else:
+        view = json.loads(row[column])
+        if fields:
+            view = project_report(view, fields)
+        body = json.dumps(view, separators=(",", ":")).encode()
+    return b'{"%s":%s}' % (wrap.encode(), body) if wrap else body
+
+
+def _report_etag(row):
+    # Re-saving a report updates its row in place: same id, new created_at
+    return 'W/"%x.%x"' % (row["id"], int(row["created_at"] * 1000000))
+
+
+async def _serve_latest(request, meeting_id, fields, compact, wrap=None):
+    fields = _parse_fields(fields)
+    column = _report_column(fields, compact)
+    if meeting_id is None:
+        row = await run_in_threadpool(store.latest, column)
+    else:
+        row = await run_in_threadpool(store.latest_for_meeting, meeting_id, column)
+    if row is None:
+        return None
+    etag = _report_etag(row)
+    return _json_bytes_response(request, lambda: _render_report(row, column, fields, wrap), etag, row["created_at"])
+
+
+async def _serve_latest_text(request, meeting_id):
+    if meeting_id is None:
+        row = await run_in_threadpool(store.latest, None)
+    else:
+        row = await run_in_threadpool(store.latest_for_meeting, meeting_id, None)
+    if row is None:
+        return None
+    etag = _report_etag(row)
+    if _not_modified(request, etag, row["created_at"]):
+        return _json_bytes_response(request, None, etag, row["created_at"])
+    text = await run_in_threadpool(text_reports.get_or_render, (row["id"], row["created_at"]), lambda: store.get_candidate_report(row["id"]))
+    if text is None:
+        # Deleted between the lookup and the render
+        return None
+    return _json_bytes_response(request, text.encode, etag, row["created_at"], media_type="text/plain; charset=utf-8")
 
-REPORT_FOLDER = "test_reports"
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Welcome to the AI Interview Report API!"}
 
+FIELDS_DESCRIPTION = "Comma-separated candidate_report fields, e.g. verdict,summary.final_rating"
+COMPACT_DESCRIPTION = "Leave out the per-question results"
+
 @app.get("/report")
-def get_report(meeting_id: str = Query(..., description="Meeting ID without timestamp")):
-    # Get all files matching the pattern
-    files = glob.glob(os.path.join(REPORT_FOLDER, f"{meeting_id}_*_report.json"))
-    if not files:
+async def get_report(
+    request: Request,
+    meeting_id: str = Query(..., description="Meeting ID without timestamp"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    compact: bool = Query(False, description=COMPACT_DESCRIPTION)
+):
+    # Latest report for the meeting, from the report store's (meeting_id, timestamp) index
+    response = await _serve_latest(request, meeting_id, fields, compact, wrap="candidate_report")
+    if response is None:
         return JSONResponse(status_code=404, content={"error": "Report not found."})
+    return response
 
-    # Get the latest report by sorting with timestamp
-    latest_file = sorted(files)[-1]
-    with open(latest_file, "r") as f:
-        data = json.load(f)
-    
-    return data
+@app.get("/report/text")
+async def get_report_text(request: Request, meeting_id: str = Query(..., description="Meeting ID without timestamp")):
+    # Text version of the meeting's latest report, rendered from the stored report
+    response = await _serve_latest_text(request, meeting_id)
+    if response is None:
+        return JSONResponse(status_code=404, content={"error": "Report not found."})
+    return response
 
 @app.get("/all_reports")
-def list_all_reports():
-    files = glob.glob(os.path.join(REPORT_FOLDER, "*_report.json"))
-    reports = []
-    for file in files:
-        with open(file, "r") as f:
-            report = json.load(f)
-            reports.append({
-                "filename": os.path.basename(file),
-                "summary": report.get("candidate_report", {}).get("summary", {}),
-                "verdict": report.get("candidate_report", {}).get("verdict")
-            })
-    return reports
+async def list_all_reports(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; the next page's cursor is in X-Next-Cursor"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    verdict: Optional[bool] = Query(None, description="true for SELECTED, false for NOT SELECTED"),
+    min_rating: Optional[float] = Query(None, ge=0, le=10),
+    max_rating: Optional[float] = Query(None, ge=0, le=10),
+    date_from: Optional[date] = Query(None, description="YYYY-MM-DD, inclusive"),
+    date_to: Optional[date] = Query(None, description="YYYY-MM-DD, inclusive"),
+    sort: str = Query("filename", description="filename, timestamp or final_rating"),
+    order: str = Query("asc", description="asc or desc")
+):
+    # Answered from the report store's indexes.
+    # Without parameters this returns every report, as it always has.
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    try:
+        reports, next_cursor = await run_in_threadpool(
+            store.query_reports,
+            verdict=verdict, min_rating=min_rating, max_rating=max_rating,
+            date_from=date_from, date_to=date_to,
+            sort=sort, descending=order == "desc", limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    body = json.dumps(reports, separators=(",", ":")).encode()
+    response = _json_bytes_response(request, lambda: body, 'W/"%s"' % hashlib.md5(body).hexdigest())
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
 
 @app.get("/report/latest")
-def get_latest_report():
-    report_files = glob.glob(os.path.join(REPORT_FOLDER, "*_report.json"))
-    if not report_files:
+async def get_latest_report(
+    request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    compact: bool = Query(False, description=COMPACT_DESCRIPTION)
+):
+    # Most recently stored report
+    response = await _serve_latest(request, None, fields, compact)
+    if response is None:
         raise HTTPException(status_code=404, detail="No reports found.")
+    return response
 
-    latest_file = max(report_files, key=os.path.getctime)
-
-    with open(latest_file, "r") as f:
-        report_data = json.load(f)
+@app.get("/report/latest/text")
+async def get_latest_report_text(request: Request):
+    response = await _serve_latest_text(request, None)
+    if response is None:
+        raise HTTPException(status_code=404, detail="No reports found.")
+    return response
 
-    return JSONResponse(content=report_data["candidate_report"])
+@app.get("/jobs")
+async def get_jobs(status: str = Query(None, description="queued, running, done or failed"), limit: int = Query(100, ge=1, le=1000)):
+    return await run_in_threadpool(list_jobs, status=status, limit=limit)
 
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: int):
+    job = await run_in_threadpool(get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
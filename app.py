@@ -1,11 +1,12 @@
 import os
 import re
 import time
-import imaplib
-import email
 from icalendar import Calendar
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.events import EVENT_JOB_MISSED
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -16,15 +17,55 @@ from webdriver_manager.chrome import ChromeDriverManager
 from audio.recorder import record_meeting_audio
 from utils.annotator import transcribe_audio
 from utils.reportGenerator import save_meeting_reports
+from utils.modelRegistry import warm_up
+from utils.streamingTranscriber import StreamingTranscriber
+from utils.jobQueue import enqueue_job, JobWorkerPool
+from utils.meetingMonitor import wait_for_meeting_end, poll_for_meeting_end
+from utils.inviteSync import InviteSync
 import threading
 from dotenv import load_dotenv
 load_dotenv()
 
 EMAIL_ACCOUNT = os.getenv("EMAIL_ACCOUNT")
 PASSWORD = os.getenv("EMAIL_PASSWORD")
-
-scheduler = BackgroundScheduler()
-scheduler.start()
+# Transcribe in chunks while the meeting is running instead of after it
+STREAMING_TRANSCRIPTION = os.getenv("STREAMING_TRANSCRIPTION") == "1"
+# "speech" records 16 kHz mono directly, "full" keeps 44.1 kHz stereo
+CAPTURE_MODE = os.getenv("CAPTURE_MODE", "full")
+# Hand finished recordings to the durable job queue instead of processing
+# them on the scheduler thread
+USE_JOB_QUEUE = os.getenv("USE_JOB_QUEUE", "1") == "1"
+job_pool = None
+# Launch Chrome this many minutes before a meeting so joining is just navigation
+BROWSER_PREWARM_MINUTES = float(os.getenv("BROWSER_PREWARM_MINUTES", "2"))
+# Pre-warmed browsers nobody picked up by then (join missed, meeting moved) are closed
+WARM_DRIVER_TTL_SECONDS = (BROWSER_PREWARM_MINUTES + 10) * 60
+
+# "observer" waits on a MutationObserver signal, "poll" checks the page every 5 s
+MEETING_END_DETECTION = os.getenv("MEETING_END_DETECTION", "observer")
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+# meeting link -> (browser already started by prewarm_browser, time.monotonic() it was started)
+_warm_drivers = {}
+_warm_drivers_lock = threading.Lock()
+
+# Jobs are kept in SQLite so a restart neither loses nor duplicates them.
+# Started in __main__ only, so worker processes importing this module don't run jobs.
+SCHEDULER_DB_URL = os.getenv("SCHEDULER_DB_URL", "sqlite:///scheduler_jobs.db")
+scheduler = BackgroundScheduler(
+    jobstores={"default": SQLAlchemyJobStore(url=SCHEDULER_DB_URL)},
+    job_defaults={"coalesce": True, "misfire_grace_time": 300}
+)
+
+
+def get_chromedriver_path():
+    # ChromeDriverManager().install() does a version check on every call, so resolve it once per process
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
 
 
 def manual_google_login():
@@ -34,7 +75,7 @@ def manual_google_login():
     options.add_argument(f"--user-data-dir=/tmp/selenium")
     options.add_argument(f"--profile-directory=Default")
 
-    service = Service(ChromeDriverManager().install())
+    service = Service(get_chromedriver_path())
     driver = webdriver.Chrome(service=service, options=options)
     driver.get("https://accounts.google.com")
 
@@ -64,7 +105,8 @@ def extract_meeting_details(msg):
             body = part.get_payload(decode=True).decode()
             match = re.search(r'https://meet\.google\.com/[a-zA-Z0-9\-]+', body)
             if match:
-                return datetime.now(), match.group()
+                # No start time in a plain-text invite
+                return None, match.group()
 
     return None, None
 
@@ -87,34 +129,132 @@ def disable_camera(driver, wait):
 
 
 # 5️⃣ Fetch New Meeting Emails
+def schedule_invites(messages):
+    scheduled_links = set()
+
+    for msg in messages:
+        subject = msg["subject"]
+        start, link = extract_meeting_details(msg)
+        if link and link not in scheduled_links:
+            if start is None:
+                # Join right away; the job id uses the mail's Date header instead of the
+                # (ever-changing) current time, so re-reading the invite can't schedule it twice
+                print(f"📅 Scheduled: {subject} now | Link: {link}")
+                schedule_meeting(datetime.now(), link, job_id=meeting_job_id(link, invite_sent_at(msg)))
+            else:
+                print(f"📅 Scheduled: {subject} at {start} | Link: {link}")
+                schedule_meeting(start, link)
+            scheduled_links.add(link)
+
+
 def check_for_meeting_invites():
-    print("📧 Logging into Gmail...")
-    mail = imaplib.IMAP4_SSL("imap.gmail.com")
-    mail.login(EMAIL_ACCOUNT, PASSWORD)
+    # One-off incremental sync: only mail newer than the last run is looked at
+    invite_sync = InviteSync(EMAIL_ACCOUNT, PASSWORD, schedule_invites)
+    invite_sync.connect()
     print("📥 Fetching unread emails...")
-    mail.select("inbox")
+    try:
+        invite_sync.sync()
+    finally:
+        invite_sync.close()
 
-    status, data = mail.search(None, 'UNSEEN')
-    email_ids = data[0].split()
-    scheduled_links = set()
 
-    for e_id in email_ids:
-        _, msg_data = mail.fetch(e_id, '(RFC822)')
-        msg = email.message_from_bytes(msg_data[0][1])
-        subject = msg["subject"]
+def watch_meeting_invites(stop_event=None):
+    # Keeps the IMAP connection open and schedules invites as they arrive (IDLE)
+    InviteSync(EMAIL_ACCOUNT, PASSWORD, schedule_invites).watch(stop_event)
 
-        if subject and ("interview" in subject.lower() or "meeting" in subject.lower()):
-            start, link = extract_meeting_details(msg)
-            if start and link and link not in scheduled_links:
-                print(f"📅 Scheduled: {subject} at {start} | Link: {link}")
-                scheduler.add_job(join_meeting, trigger='date', run_date=start, args=[link])
-                scheduled_links.add(link)
 
-    mail.logout()
+def invite_sent_at(msg):
+    # The mail's Date header, stable across syncs; None when missing or unparseable
+    try:
+        return parsedate_to_datetime(msg["Date"])
+    except (TypeError, ValueError):
+        return None
 
 
-def join_meeting(link):
-    print("🚀 Opening browser to join meeting:", link)
+def meeting_job_id(link, start):
+    # Job ids are the store's primary key, so (link, start) can only be scheduled once.
+    # start=None keys on the link alone.
+    if start is None:
+        return link
+    if isinstance(start, datetime) and start.tzinfo is not None:
+        start = start.astimezone(timezone.utc)
+    return f"{link}|{start.isoformat()}"
+
+
+def schedule_meeting(start, link, job_id=None):
+    # Idempotent: re-parsing the same invite replaces the job instead of adding another
+    job_id = job_id or meeting_job_id(link, start)
+    scheduler.add_job(join_meeting, trigger='date', run_date=start, args=[link],
+                      id=f"join:{job_id}", replace_existing=True)
+    schedule_browser_prewarm(start, link, job_id)
+
+
+def schedule_browser_prewarm(start, link, job_id):
+    if BROWSER_PREWARM_MINUTES <= 0 or not isinstance(start, datetime):
+        return
+    prewarm_at = start - timedelta(minutes=BROWSER_PREWARM_MINUTES)
+    if prewarm_at > datetime.now(start.tzinfo):
+        scheduler.add_job(prewarm_browser, trigger='date', run_date=prewarm_at, args=[link],
+                          id=f"prewarm:{job_id}", replace_existing=True)
+
+
+def prewarm_browser(link):
+    # Start Chrome and load Meet ahead of time; join_meeting picks this driver up
+    print("🔥 Pre-warming browser for meeting:", link)
+    try:
+        # Closes any earlier pre-warmed browser first, this meeting's included
+        driver = create_meeting_driver()
+        driver.get("https://meet.google.com")
+    except Exception as e:
+        print("❌ Failed to pre-warm browser:", e)
+        return
+    with _warm_drivers_lock:
+        _warm_drivers[link] = (driver, time.monotonic())
+
+
+def quit_driver(driver):
+    # A Chrome left running keeps the lock on --user-data-dir and blocks the next launch
+    try:
+        driver.quit()
+    except Exception as e:
+        print("⚠️ Failed to close browser:", e)
+
+
+def discard_warm_driver(link):
+    with _warm_drivers_lock:
+        entry = _warm_drivers.pop(link, None)
+    if entry:
+        print("🧹 Closing pre-warmed browser for meeting:", link)
+        quit_driver(entry[0])
+
+
+def discard_warm_drivers():
+    # Every launch shares one --user-data-dir (it holds the Google login), so an
+    # unclaimed pre-warmed browser has to go first; its meeting starts a fresh one
+    with _warm_drivers_lock:
+        entries = list(_warm_drivers.items())
+        _warm_drivers.clear()
+    for link, (driver, _) in entries:
+        print("🧹 Closing pre-warmed browser for meeting:", link)
+        quit_driver(driver)
+
+
+def expire_warm_drivers():
+    now = time.monotonic()
+    with _warm_drivers_lock:
+        expired = [link for link, (_, started) in _warm_drivers.items() if now - started > WARM_DRIVER_TTL_SECONDS]
+    for link in expired:
+        discard_warm_driver(link)
+
+
+def on_job_missed(event):
+    # A join that misfired will never pick up its pre-warmed browser
+    if event.job_id.startswith("join:"):
+        discard_warm_driver(event.job_id[len("join:"):].split("|", 1)[0])
+
+
+def create_meeting_driver():
+    discard_warm_drivers()
 
     options = Options()
     options.add_argument("--use-fake-ui-for-media-stream")
@@ -131,10 +271,29 @@ def join_meeting(link):
         "profile.default_content_setting_values.media_stream_mic": 1
     })
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.get(link)
+    service = Service(get_chromedriver_path())
+    return webdriver.Chrome(service=service, options=options)
+
 
+def join_meeting(link):
+    print("🚀 Opening browser to join meeting:", link)
+
+    with _warm_drivers_lock:
+        entry = _warm_drivers.pop(link, None)
+    driver = entry[0] if entry else None
+    if driver is not None:
+        try:
+            driver.get(link)
+        except Exception as e:
+            print("⚠️ Pre-warmed browser unusable, starting a new one:", e)
+            quit_driver(driver)
+            driver = None
+    if driver is None:
+        driver = create_meeting_driver()
+        driver.get(link)
+
+    audio_file_path = None
+    streamer = None
     try:
         wait = WebDriverWait(driver, 40)
 
@@ -159,50 +318,81 @@ def join_meeting(link):
 
         # ✅ Start recording AFTER joining
         stop_flag = {"stop": False}
-        audio_file_path = None
+        streamer = StreamingTranscriber() if STREAMING_TRANSCRIPTION else None
 
         def stop_check():
             return stop_flag["stop"]
 
         def record_audio():
             nonlocal audio_file_path
-            audio_file_path = record_meeting_audio(device_index=2, stop_flag=stop_check)
+            audio_file_path = record_meeting_audio(device_index=2, stop_flag=stop_check,
+                                                   on_chunk=streamer.feed if streamer else None,
+                                                   capture_mode=CAPTURE_MODE)
 
         audio_thread = threading.Thread(target=record_audio)
         audio_thread.start()
         print("🎙️ Recording started. Monitoring meeting...")
 
         print("🕵️ Monitoring meeting status...")
-        meeting_ended = False
-        while not meeting_ended:
-            try:
-                end_xpath = '//span[contains(text(), "Return to home screen") or contains(text(), "You’ve left the meeting")]'
-                driver.find_element(By.XPATH, end_xpath)
-                meeting_ended = True
-                print("📴 Meeting has ended!")
-            except:
-                time.sleep(5)
-        # ✅ Set stop_flag and wait for recording thread to finish
-        stop_flag["stop"] = True
-        audio_thread.join()
+        try:
+            if MEETING_END_DETECTION == "poll":
+                status = poll_for_meeting_end(driver)
+            else:
+                status = wait_for_meeting_end(
+                    driver, on_participants_change=lambda n: print(f"👥 Participants: {n}")
+                )
+            print(f"📴 Meeting has ended! (detection latency: {status['latency_ms']} ms)")
+        finally:
+            # ✅ Set stop_flag and wait for recording thread to finish, even if monitoring broke
+            stop_flag["stop"] = True
+            audio_thread.join()
         print("🛑 Meeting ended, audio thread stopped.")
-
-        if audio_file_path:
-            transcript_path = transcribe_audio(audio_file_path)
-            verdict, final_rating = save_meeting_reports(transcript_path, link)
-            print("Verdict:" , verdict)
-            print("Rating:", final_rating)
     except Exception as e:
         print("❌ Error during meeting:", e)
     finally:
-        driver.quit()
+        quit_driver(driver)
+        # Runs even if joining or monitoring broke, so a recording is never left unprocessed
+        segments = streamer.finish() if streamer else None
+        if audio_file_path:
+            try:
+                process_recording(audio_file_path, link, segments)
+            except Exception as e:
+                print("❌ Failed to process recording:", e)
+
+
+def process_recording(audio_file_path, link, segments=None):
+    if USE_JOB_QUEUE:
+        enqueue_job(audio_file_path, link, segments=segments)
+        if job_pool:
+            job_pool.notify()
+    else:
+        transcript_path = transcribe_audio(audio_file_path, segments=segments)
+        verdict, final_rating = save_meeting_reports(transcript_path, link)
+        print("Verdict:" , verdict)
+        print("Rating:", final_rating)
 
 
 if __name__ == "__main__":
     # manual_google_login()  # Run once for session
-    check_for_meeting_invites()
+    # Only due jobs are read from the store, so this stays cheap with many future invites
+    scheduler.add_listener(on_job_missed, EVENT_JOB_MISSED)
+    scheduler.start()
+
+    if USE_JOB_QUEUE:
+        # Also picks up jobs left over from a previous run
+        job_pool = JobWorkerPool().start()
+
+    if os.getenv("WARM_UP_MODELS") == "1":
+        # Load models in the background while we wait for invites
+        threading.Thread(target=warm_up, daemon=True).start()
+
+    if os.getenv("WATCH_INVITES", "1") == "1":
+        threading.Thread(target=watch_meeting_invites, daemon=True).start()
+    else:
+        check_for_meeting_invites()
 
     while True:
         # Or manually trigger one for testing:
         # join_meeting("https://meet.google.com/xxx-xxxx-xxx")
         time.sleep(60)
+        expire_warm_drivers()
@@ -1,37 +1,159 @@
 # audio/recorder.py
 import sounddevice as sd
 import soundfile as sf
-import queue
+import numpy as np
+import threading
+import uuid
 import os
 from datetime import datetime
 
-q = queue.Queue()
+class RecordingSession:
+    # One capture stream with its own bounded ring buffer, so concurrent
+    # recordings never share frames and a slow disk can't grow memory.
+    # overflow_policy "drop" discards a block when the buffer is full,
+    # "block" first waits up to block_timeout for the writer to catch up.
+    def __init__(self, device_index=2, samplerate=44100, channels=2, buffer_seconds=30, overflow_policy="drop", block_timeout=0.05):
+        if overflow_policy not in ("drop", "block"):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.session_id = uuid.uuid4().hex[:8]
+        self.device_index = device_index
+        self.samplerate = samplerate
+        self.channels = channels
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
 
-def audio_callback(indata, frames, time, status):
-    if status:
-        print("⚠️", status)
-    q.put(indata.copy())
+        self.capacity = int(buffer_seconds * samplerate)
+        self._buffer = np.zeros((self.capacity, channels), dtype=np.float32)
+        self._head = 0  # total frames written into the ring
+        self._tail = 0  # total frames read out of the ring
+        self._cond = threading.Condition()
 
-def record_meeting_audio(output_dir="recordings", device_index=2, stop_flag=None):
-    samplerate = 44100
-    channels = 2
+        self.frames_captured = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.max_queue_depth = 0
+        self.status_flags = {}
+
+    def _callback(self, indata, frames, time, status):
+        if status:
+            print("⚠️", status)
+            with self._cond:
+                self.status_flags[str(status)] = self.status_flags.get(str(status), 0) + 1
+        self.push(indata)
+
+    def push(self, block):
+        n = len(block)
+        with self._cond:
+            self.frames_captured += n
+            if n > self.capacity - (self._head - self._tail) and self.overflow_policy == "block":
+                self._cond.wait_for(lambda: n <= self.capacity - (self._head - self._tail), timeout=self.block_timeout)
+            if n > self.capacity - (self._head - self._tail):
+                self.frames_dropped += n
+                return False
+
+            start = self._head % self.capacity
+            first = min(n, self.capacity - start)
+            self._buffer[start:start + first] = block[:first]
+            self._buffer[:n - first] = block[first:]
+            self._head += n
+            self.max_queue_depth = max(self.max_queue_depth, self._head - self._tail)
+            self._cond.notify_all()
+        return True
+
+    def pop(self, timeout=1):
+        # Everything buffered so far as one array, or None after timeout
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._head > self._tail, timeout=timeout):
+                return None
+            n = self._head - self._tail
+            start = self._tail % self.capacity
+            first = min(n, self.capacity - start)
+            data = np.concatenate([self._buffer[start:start + first], self._buffer[:n - first]])
+            self._tail += n
+            self._cond.notify_all()
+        return data
+
+    def queue_depth(self):
+        with self._cond:
+            return self._head - self._tail
+
+    def stats(self):
+        with self._cond:
+            return {
+                "frames_captured": self.frames_captured,
+                "frames_written": self.frames_written,
+                "frames_dropped": self.frames_dropped,
+                "max_queue_depth": self.max_queue_depth,
+                "status_flags": dict(self.status_flags)
+            }
+
+    def input_stream(self):
+        return sd.InputStream(samplerate=self.samplerate, device=self.device_index, channels=self.channels,
+                              dtype='float32', callback=self._callback)
+
+# "full": device rate stereo as captured. "speech": downmixed and resampled
+# to 16 kHz mono while recording, the format Whisper and pyannote consume.
+CAPTURE_MODES = ("full", "speech")
+SPEECH_SAMPLERATE = 16000
+
+def record_meeting_audio(output_dir="recordings", device_index=2, stop_flag=None, on_chunk=None, chunk_seconds=30, capture_mode="full", session=None):
+    # on_chunk(audio, samplerate) receives the audio in chunk_seconds pieces
+    # while recording, e.g. StreamingTranscriber.feed. Pass a RecordingSession
+    # to pick the buffer size/overflow policy or to read its counters afterwards.
+    if capture_mode not in CAPTURE_MODES:
+        raise ValueError(f"Unknown capture mode: {capture_mode}")
+
+    session = session or RecordingSession(device_index=device_index)
+    samplerate = session.samplerate
+    channels = session.channels
     recording = True
 
+    resampler = None
+    out_samplerate, out_channels = samplerate, channels
+    if capture_mode == "speech":
+        import soxr
+        out_samplerate, out_channels = SPEECH_SAMPLERATE, 1
+        resampler = soxr.ResampleStream(samplerate, out_samplerate, 1, dtype='float32')
+
+    chunk_frames = int(chunk_seconds * out_samplerate)
+    pending, pending_frames = [], 0
+
+    def process(data, last=False):
+        nonlocal pending, pending_frames
+        session.frames_written += len(data)  # counted in captured frames, before resampling
+        if resampler:
+            data = resampler.resample_chunk(data.mean(axis=1, dtype=np.float32), last=last)
+        if len(data):
+            file.write(data)
+
+        if on_chunk:
+            pending.append(data)
+            pending_frames += len(data)
+            if pending_frames >= chunk_frames or (last and pending_frames):
+                on_chunk(np.concatenate(pending), out_samplerate)
+                pending, pending_frames = [], 0
+
     os.makedirs(output_dir, exist_ok=True)
-    filename = f"meeting_audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav"
+    filename = f"meeting_audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{session.session_id}.wav"
     output_path = os.path.join(output_dir, filename)
 
     try:
-        with sf.SoundFile(output_path, mode='w', samplerate=samplerate, channels=channels) as file:
-            with sd.InputStream(samplerate=samplerate, device=device_index, channels=channels, callback=audio_callback):
-                print(f"🎙️ Recording started on device {device_index}...")
+        with sf.SoundFile(output_path, mode='w', samplerate=out_samplerate, channels=out_channels, subtype='PCM_16') as file:
+            with session.input_stream():
+                print(f"🎙️ Recording started on device {session.device_index} ({capture_mode} mode)...")
                 while recording and (stop_flag is None or not stop_flag()):
-                    try:
-                        data = q.get(timeout=1)
-                        file.write(data)
-                    except queue.Empty:
-                        continue
+                    data = session.pop(timeout=1)
+                    if data is not None:
+                        process(data)
+
+            # Write out what was still buffered when the stream stopped
+            data = session.pop(timeout=0)
+            if data is not None:
+                process(data)
+            # Flush the resampler's tail and the last partial chunk
+            process(np.zeros((0, channels), dtype=np.float32), last=True)
         print("🛑 Recording stopped and saved:", output_path)
+        print("📊 Capture stats:", session.stats())
     except Exception as e:
         print("❌ Error while recording:", e)
         return None
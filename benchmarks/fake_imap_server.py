@@ -0,0 +1,195 @@
+# benchmarks/fake_imap_server.py
+# Minimal local IMAP stand-in for Gmail: enough of IMAP4rev1 (LOGIN, SELECT,
+# UID SEARCH/FETCH/STORE, plain FETCH, IDLE, NOOP, LOGOUT) to exercise app.py's invite
+# sync without a network. Counts the bytes it sends so fetch strategies
+# can be compared.
+import re
+import socketserver
+import threading
+
+UIDVALIDITY = 1
+
+
+class Mailbox:
+    def __init__(self):
+        self.messages = []  # [uid, seen, raw bytes]
+        self.next_uid = 1
+        self.bytes_sent = 0
+        self.lock = threading.Condition()
+
+    def append(self, raw, seen=False):
+        with self.lock:
+            self.messages.append([self.next_uid, seen, raw])
+            self.next_uid += 1
+            self.lock.notify_all()
+
+    def count(self):
+        with self.lock:
+            return len(self.messages)
+
+
+def _uid_set_matches(uid_set, uid, max_uid):
+    for part in uid_set.split(","):
+        if ":" in part:
+            low, high = part.split(":")
+            low = max_uid if low == "*" else int(low)
+            high = max_uid if high == "*" else int(high)
+            if min(low, high) <= uid <= max(low, high):
+                return True
+        elif uid == (max_uid if part == "*" else int(part)):
+            return True
+    return False
+
+
+def _header_fields(raw, fields):
+    header = raw.split(b"\r\n\r\n", 1)[0].split(b"\r\n")
+    wanted = [f.lower() for f in fields]
+    kept, keep = [], False
+    for line in header:
+        if line[:1] in (b" ", b"\t"):
+            if keep:
+                kept.append(line)
+            continue
+        keep = line.split(b":", 1)[0].decode(errors="ignore").lower() in wanted
+        if keep:
+            kept.append(line)
+    return b"\r\n".join(kept) + b"\r\n\r\n"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def send(self, data):
+        self.wfile.write(data)
+        self.wfile.flush()
+        self.server.mailbox.bytes_sent += len(data)
+
+    def handle(self):
+        mailbox = self.server.mailbox
+        self.send(b"* OK fake IMAP ready\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            tag, _, rest = line.decode().rstrip("\r\n").partition(" ")
+            command, _, args = rest.partition(" ")
+            command = command.upper()
+
+            if command == "CAPABILITY":
+                self.send(b"* CAPABILITY IMAP4rev1 IDLE\r\n")
+            elif command == "LOGIN":
+                pass
+            elif command in ("SELECT", "EXAMINE"):
+                with mailbox.lock:
+                    self.send(f"* {len(mailbox.messages)} EXISTS\r\n".encode())
+                    self.send(f"* OK [UIDVALIDITY {UIDVALIDITY}] UIDs valid\r\n".encode())
+                    self.send(f"* OK [UIDNEXT {mailbox.next_uid}] next UID\r\n".encode())
+            elif command == "SEARCH":
+                self.search(args, use_uid=False)
+            elif command == "FETCH":
+                self.fetch(args, use_uid=False)
+            elif command == "UID":
+                sub, _, sub_args = args.partition(" ")
+                if sub.upper() == "SEARCH":
+                    self.search(sub_args, use_uid=True)
+                elif sub.upper() == "FETCH":
+                    self.fetch(sub_args, use_uid=True)
+                elif sub.upper() == "STORE":
+                    self.store(sub_args)
+            elif command == "IDLE":
+                self.idle(tag)
+                continue
+            elif command == "LOGOUT":
+                self.send(b"* BYE\r\n")
+                self.send(f"{tag} OK LOGOUT completed\r\n".encode())
+                return
+            self.send(f"{tag} OK {command} completed\r\n".encode())
+
+    def search(self, args, use_uid):
+        tokens = args.upper().split()
+        unseen = "UNSEEN" in tokens
+        uid_range = tokens[tokens.index("UID") + 1] if "UID" in tokens else None
+        with self.server.mailbox.lock:
+            messages = self.server.mailbox.messages
+            max_uid = messages[-1][0] if messages else 0
+            found = [
+                str(uid if use_uid else seq)
+                for seq, (uid, seen, _) in enumerate(messages, 1)
+                if (not unseen or not seen) and (uid_range is None or _uid_set_matches(uid_range, uid, max_uid))
+            ]
+        self.send(f"* SEARCH {' '.join(found)}\r\n".replace(" \r\n", "\r\n").encode())
+
+    def fetch(self, args, use_uid):
+        id_set, _, items = args.partition(" ")
+        items = items.upper()
+        with self.server.mailbox.lock:
+            messages = self.server.mailbox.messages
+            max_id = (messages[-1][0] if use_uid else len(messages)) if messages else 0
+            for seq, message in enumerate(messages, 1):
+                uid, _, raw = message
+                if not _uid_set_matches(id_set, uid if use_uid else seq, max_id):
+                    continue
+                fields = re.search(r"HEADER\.FIELDS \(([^)]*)\)", items)
+                if fields:
+                    name = f"BODY[HEADER.FIELDS ({fields.group(1)})]"
+                    body = _header_fields(raw, fields.group(1).split())
+                elif "BODY.PEEK[]" in items:
+                    name, body = "BODY[]", raw
+                else:
+                    name, body = "RFC822", raw
+                    message[1] = True  # full fetch without PEEK marks it seen
+                self.send(f"* {seq} FETCH (UID {uid} {name} {{{len(body)}}}\r\n".encode() + body + b")\r\n")
+
+    def store(self, args):
+        # Only "+FLAGS (\Seen)", the one flag change the invite sync makes
+        uid_set, _, flags = args.partition(" ")
+        if "\\SEEN" not in flags.upper():
+            return
+        with self.server.mailbox.lock:
+            messages = self.server.mailbox.messages
+            max_uid = messages[-1][0] if messages else 0
+            for seq, message in enumerate(messages, 1):
+                if _uid_set_matches(uid_set, message[0], max_uid):
+                    message[1] = True
+                    self.send(f"* {seq} FETCH (UID {message[0]} FLAGS (\\Seen))\r\n".encode())
+
+    def idle(self, tag):
+        mailbox = self.server.mailbox
+        self.send(b"+ idling\r\n")
+        known = mailbox.count()
+        done = threading.Event()
+
+        def push_new_mail():
+            nonlocal known
+            with mailbox.lock:
+                while not done.is_set():
+                    if len(mailbox.messages) != known:
+                        known = len(mailbox.messages)
+                        self.send(f"* {known} EXISTS\r\n".encode())
+                    mailbox.lock.wait(0.1)
+
+        pusher = threading.Thread(target=push_new_mail, daemon=True)
+        pusher.start()
+        self.rfile.readline()  # DONE
+        done.set()
+        pusher.join()
+        self.send(f"{tag} OK IDLE terminated\r\n".encode())
+
+
+class FakeImapServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), _Handler)
+        self.mailbox = Mailbox()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,111 @@
+# benchmarks/invite_sync.py
+# Invite sync against the local IMAP stand-in: bytes and time for the old
+# "SEARCH UNSEEN + FETCH (RFC822) per message" loop vs. the incremental
+# header-only sync, and how quickly IDLE delivers a new invite.
+import os
+import sys
+import json
+import time
+import email
+import imaplib
+import argparse
+import tempfile
+import threading
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from email.mime.application import MIMEApplication
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.inviteSync import InviteSync, is_meeting_subject
+from benchmarks.fake_imap_server import FakeImapServer
+
+
+def make_message(i, invite, attachment_kb):
+    msg = MIMEMultipart()
+    msg["Subject"] = f"Interview with candidate {i}" if invite else f"Weekly newsletter {i}"
+    msg["From"] = "sender@example.com"
+    msg.attach(MIMEText(f"Join at https://meet.google.com/abc-defg-{i:03d}" if invite else "Hello!"))
+    if not invite:
+        msg.attach(MIMEApplication(os.urandom(attachment_kb * 1024), Name="report.pdf"))
+    return msg.as_bytes().replace(b"\n", b"\r\n")
+
+
+def fill_mailbox(server, count, invite_every, attachment_kb):
+    for i in range(count):
+        server.mailbox.append(make_message(i, i % invite_every == 0, attachment_kb))
+
+
+def legacy_sync(port):
+    # What check_for_meeting_invites used to do
+    mail = imaplib.IMAP4("127.0.0.1", port)
+    mail.login("user", "password")
+    mail.select("inbox")
+    _, data = mail.search(None, "UNSEEN")
+    found = 0
+    for e_id in data[0].split():
+        _, msg_data = mail.fetch(e_id, "(RFC822)")
+        msg = email.message_from_bytes(msg_data[0][1])
+        if is_meeting_subject(msg["subject"]):
+            found += 1
+    mail.logout()
+    return found
+
+
+def measure(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Invite sync benchmark")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--invite-every", type=int, default=20)
+    parser.add_argument("--attachment-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    results = {}
+    state_path = os.path.join(tempfile.mkdtemp(), "state.json")
+
+    server = FakeImapServer().start()
+    fill_mailbox(server, args.messages, args.invite_every, args.attachment_kb)
+    found, seconds = measure(lambda: legacy_sync(server.port))
+    results["legacy"] = {"invites": found, "seconds": round(seconds, 3), "bytes": server.mailbox.bytes_sent}
+    server.stop()
+
+    server = FakeImapServer().start()
+    fill_mailbox(server, args.messages, args.invite_every, args.attachment_kb)
+    invites = []
+    sync = InviteSync("user", "password", invites.extend, host="127.0.0.1", port=server.port, use_ssl=False, state_path=state_path)
+
+    def first_sync():
+        sync.connect()
+        return sync.sync()
+
+    found, seconds = measure(first_sync)
+    results["incremental"] = {"invites": found, "seconds": round(seconds, 3), "bytes": server.mailbox.bytes_sent}
+
+    before = server.mailbox.bytes_sent
+    found, seconds = measure(sync.sync)
+    results["incremental_resync"] = {"invites": found, "seconds": round(seconds, 3), "bytes": server.mailbox.bytes_sent - before}
+    sync.close()
+
+    # IDLE push: time from the invite landing in the mailbox to on_invites
+    delivered = threading.Event()
+    watcher = InviteSync("user", "password", lambda messages: delivered.set(), host="127.0.0.1", port=server.port,
+                         use_ssl=False, state_path=state_path)
+    stop = threading.Event()
+    threading.Thread(target=watcher.watch, args=(stop,), kwargs={"idle_seconds": 5}, daemon=True).start()
+    time.sleep(1)
+    arrived = time.perf_counter()
+    server.mailbox.append(make_message(args.messages, True, 0))
+    delivered.wait(30)
+    results["idle_delivery_ms"] = round((time.perf_counter() - arrived) * 1000, 1) if delivered.is_set() else None
+    stop.set()
+    server.stop()
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/meeting_end_latency.py
+# Stop latency of the two meeting-end detection modes against
+# benchmarks/fake_meet.html in headless Chrome: the time between the end
+# screen appearing and Python returning from the wait.
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.meetingMonitor import wait_for_meeting_end, poll_for_meeting_end
+
+PAGE = Path(__file__).with_name("fake_meet.html").resolve().as_uri()
+
+
+def run_trial(driver, mode, end_after_ms, end_hidden=False):
+    driver.get(f"{PAGE}?end_after={end_after_ms}&join_after={end_after_ms // 2}&end_hidden={int(end_hidden)}")
+    participant_changes = []
+    if mode == "observer":
+        wait_for_meeting_end(driver, timeout=end_after_ms / 1000 + 30, on_participants_change=participant_changes.append)
+    else:
+        poll_for_meeting_end(driver, interval=5, timeout=end_after_ms / 1000 + 30)
+    detected_at = time.time() * 1000
+    page_ended_at = driver.execute_script("return window.__pageEndedAt;")
+    return detected_at - page_ended_at, participant_changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Meeting-end detection latency")
+    parser.add_argument("--trials", type=int, default=3)
+    parser.add_argument("--end-after-ms", type=int, default=3000)
+    parser.add_argument("--end-hidden", action="store_true", help="End screen is in the page from the start and gets unhidden")
+    args = parser.parse_args()
+
+    options = Options()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    results = {}
+    try:
+        for mode in ("observer", "poll"):
+            latencies = []
+            for _ in range(args.trials):
+                latency, participants = run_trial(driver, mode, args.end_after_ms, args.end_hidden)
+                latencies.append(latency)
+            results[mode] = {
+                "mean_latency_ms": round(sum(latencies) / len(latencies), 1),
+                "max_latency_ms": round(max(latencies), 1),
+                "participant_changes_seen": participants if mode == "observer" else None
+            }
+    finally:
+        driver.quit()
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# benchmarks/pipeline.py
+# End-to-end pipeline benchmark on synthetic two-speaker interviews made
+# offline (benchmarks/synthetic_interview.py). Times every stage the
+# pipeline reports: silence removal, Whisper, pyannote, annotation,
+# sentiment, relevance, summarization and report writing. Each run starts
+# with an empty embedding cache, and relevance is timed again once the cache
+# is warm ("relevance_warm"). "--backend stub" swaps in weight-free models
+# (benchmarks/stub_models.py) so it runs in CI; "--backend real" uses the
+# registry's actual models on real recordings given with --audio, since
+# Whisper hears nothing in the synthetic tones. Results are JSON and can be
+# compared against a previous run with --baseline.
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+import soundfile as sf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.synthetic_interview import synthesize_interview
+
+MODEL_NAMES = ["whisper-tiny", "diarization", "embedding", "sentiment", "summarizer"]
+# Slowdowns smaller than this are timer noise for the sub-millisecond stages
+MIN_REGRESSION_SECONDS = 0.05
+
+
+def run_once(minutes, backend, vad_mode, summary_mode, seed, workdir, audio=None):
+    # audio: a real recording to run instead of a synthetic interview of `minutes`
+    from utils.modelRegistry import warm_up, clear_models
+    from utils.annotator import transcribe_audio
+    from utils.embeddingCache import use_embedding_cache
+    from utils.reportGenerator import save_meeting_reports, analyse_annotated_transcript
+
+    if audio:
+        audio_path = audio
+        duration = sf.info(audio).duration
+        minutes = round(duration / 60, 1)
+        script_lines = None
+        synthesis_seconds = 0.0
+    else:
+        audio_path = os.path.join(workdir, f"interview_{minutes}min.wav")
+        start = time.perf_counter()
+        synthetic = synthesize_interview(audio_path, minutes, seed=seed)
+        synthesis_seconds = time.perf_counter() - start
+        duration = synthetic["duration"]
+        script_lines = len(synthetic["script"])
+
+    if backend == "stub":
+        from benchmarks.stub_models import install_stub_models
+        install_stub_models(synthetic["script"])
+
+    # Model loading is reported on its own, not folded into the first stage that uses a model
+    start = time.perf_counter()
+    warm_up(MODEL_NAMES)
+    model_load_seconds = time.perf_counter() - start
+
+    # Cold cache, otherwise the warm-up run and earlier lengths turn "relevance" into cache hits
+    cache = use_embedding_cache(os.path.join(workdir, f"embeddings_{minutes}min"))
+
+    timings = {}
+    start = time.perf_counter()
+    transcript_path = transcribe_audio(audio_path, vad_mode=vad_mode, parallel=False, timings=timings)
+    if not transcript_path:
+        raise RuntimeError(f"No transcript for {audio or f'the {minutes} minute interview'}")
+    verdict, final_rating = save_meeting_reports(transcript_path, f"https://meet.google.com/bench-{minutes}min",
+                                                 summary_mode=summary_mode, timings=timings)
+    pipeline_seconds = time.perf_counter() - start
+    timings.pop("total", None)
+    cold_cache = cache.stats()
+
+    # Same transcript again: every question and answer is now a cache hit
+    warm_timings = {}
+    analyse_annotated_transcript(transcript_path, warm_timings)
+    timings["relevance_warm"] = warm_timings["relevance"]
+
+    with open(transcript_path, "r") as f:
+        transcript_lines = sum(1 for line in f if line.strip())
+
+    if backend == "stub":
+        # Next run registers stubs with its own script
+        clear_models()
+
+    return {
+        "minutes": minutes,
+        "recording": os.path.basename(audio) if audio else None,
+        "audio_seconds": round(duration, 1),
+        "script_lines": script_lines,
+        "transcript_lines": transcript_lines,
+        "verdict": verdict,
+        "final_rating": final_rating,
+        "synthesis_seconds": round(synthesis_seconds, 3),
+        "model_load_seconds": round(model_load_seconds, 3),
+        "stages": {stage: round(seconds, 4) for stage, seconds in timings.items()},
+        "embedding_cache": {"hits": cold_cache["hits"], "misses": cold_cache["misses"]},
+        "pipeline_seconds": round(pipeline_seconds, 3),
+        "realtime_factor": round(pipeline_seconds / duration, 5),
+    }
+
+
+def _run_key(run):
+    return run.get("recording") or run["minutes"]
+
+
+def compare(results, baseline, tolerance):
+    # Stages that got more than `tolerance` slower than in the baseline run of the same length
+    regressions = []
+    previous = {_run_key(run): run for run in baseline.get("runs", [])}
+    for run in results["runs"]:
+        old = previous.get(_run_key(run))
+        if not old:
+            continue
+        stages = dict(run["stages"], pipeline=run["pipeline_seconds"])
+        old_stages = dict(old["stages"], pipeline=old["pipeline_seconds"])
+        for stage, seconds in stages.items():
+            before = old_stages.get(stage)
+            if before and seconds > before * (1 + tolerance) and seconds - before > MIN_REGRESSION_SECONDS:
+                regressions.append({"minutes": run["minutes"], "recording": run.get("recording"), "stage": stage,
+                                    "baseline_seconds": before, "seconds": seconds,
+                                    "ratio": round(seconds / before, 2)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline timings on synthetic interviews")
+    parser.add_argument("--minutes", default="5,30,120", help="Comma-separated interview lengths")
+    parser.add_argument("--backend", choices=["stub", "real"], default="stub")
+    parser.add_argument("--audio", help="Comma-separated real recordings (e.g. recordings/*.wav) for --backend real; replaces --minutes")
+    parser.add_argument("--vad-mode", choices=["librosa", "streaming"], default="librosa")
+    parser.add_argument("--summary-mode", choices=["abstractive", "extractive"], default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup-minutes", type=float, default=0.5,
+                        help="Untimed run first so one-off imports (librosa, torch, textstat) don't land in a stage; 0 skips it")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown per stage before it counts as a regression")
+    args = parser.parse_args()
+    if args.backend == "real" and not args.audio:
+        parser.error("--backend real needs --audio: Whisper and pyannote get nothing usable out of the synthetic tones")
+    if args.backend == "stub" and args.audio:
+        parser.error("--audio needs --backend real: the stub models only know the synthetic scripts")
+
+    minutes = [float(m) if "." in m else int(m) for m in args.minutes.split(",")]
+    # Absolute, the runs happen inside a temp dir
+    recordings = [os.path.abspath(path) for path in args.audio.split(",")] if args.audio else []
+    results = {"backend": args.backend, "vad_mode": args.vad_mode, "summary_mode": args.summary_mode,
+               "seed": args.seed, "runs": []}
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # recordings/, the embedding caches and reports.db all end up in the temp dir
+        os.chdir(workdir)
+        try:
+            # The pipeline prints progress and transcripts; keep stdout for the JSON
+            with contextlib.redirect_stdout(sys.stderr):
+                if recordings:
+                    # Real models: the warm-up run is the first recording
+                    if args.warmup_minutes:
+                        run_once(None, args.backend, args.vad_mode, args.summary_mode, args.seed, workdir, recordings[0])
+                    for recording in recordings:
+                        results["runs"].append(run_once(None, args.backend, args.vad_mode, args.summary_mode,
+                                                        args.seed, workdir, recording))
+                else:
+                    if args.warmup_minutes:
+                        run_once(args.warmup_minutes, args.backend, args.vad_mode, args.summary_mode, args.seed, workdir)
+                    for length in minutes:
+                        results["runs"].append(run_once(length, args.backend, args.vad_mode, args.summary_mode, args.seed, workdir))
+        finally:
+            os.chdir(cwd)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            results["regressions"] = compare(results, json.load(f), args.tolerance)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if results.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
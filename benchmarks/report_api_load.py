@@ -0,0 +1,194 @@
+# benchmarks/report_api_load.py
+# Local load generator for api_server.py. Fills a temporary report store with
+# synthetic reports scaled up from the real ones in test_reports/, serves the
+# app with uvicorn on a free port and hammers each endpoint with concurrent
+# keep-alive requests: plain, gzip and conditional (If-None-Match -> 304),
+# plus the compact view.
+import os
+import sys
+import glob
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+import aiohttp
+import uvicorn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.reportStore import ReportStore, REPORT_FOLDER, _report_row
+from utils.reportGenerator import compute_verdict
+
+
+def load_templates(folder=REPORT_FOLDER):
+    # candidate_reports written by the pipeline; the synthetic reports are scaled-up copies
+    templates = []
+    for path in sorted(glob.glob(os.path.join(folder, "*.json"))):
+        with open(path, "r") as f:
+            templates.append(json.load(f)["candidate_report"])
+    if not templates:
+        sys.exit(f"❌ No report templates in {folder}")
+    return templates
+
+
+def make_report(i, results_per_report, templates):
+    # Same fields save_meeting_reports writes, with the template's real questions and
+    # answers repeated up to results_per_report and the sentiment mix varied per report
+    template = templates[i % len(templates)]
+    rng = random.Random(i)
+    positive_share = rng.uniform(0.1, 0.9)
+    results = []
+    for q in range(results_per_report):
+        source = template["results"][(q + i) % len(template["results"])]
+        sentiment = "Positive" if rng.random() < positive_share else rng.choice(["Neutral", "Negative"])
+        results.append({
+            "question": source["question"],
+            "answer": source["answer"],
+            "sentiment": sentiment,
+            "sentiment_confidence": round(rng.uniform(0.5, 1.0), 4),
+            "relevance": source["relevance"],
+            "raw_similarity": source["raw_similarity"]
+        })
+
+    sentiment_summary = {label: sum(r["sentiment"] == label.capitalize() for r in results)
+                         for label in ("positive", "neutral", "negative")}
+    # Rating over a 10-answer interview, so the ratings spread over the whole 0-10 range
+    verdict, final_rating = compute_verdict({label: count * 10 / max(1, results_per_report)
+                                             for label, count in sentiment_summary.items()})
+    day = datetime(2025, 1, 1) + timedelta(minutes=i)
+    return {"candidate_report": {
+        "date": day.strftime('%Y-%m-%d'),
+        "time": day.strftime('%H:%M'),
+        "questions_answered": len(results),
+        "results": results,
+        "communication_skill_analysis": dict(template["communication_skill_analysis"]),
+        "summary": {
+            "positive_responses": sentiment_summary["positive"],
+            "neutral_responses": sentiment_summary["neutral"],
+            "negative_responses": sentiment_summary["negative"],
+            "final_rating": final_rating,
+            "summary_text": template["summary"].get("summary_text") or " ".join(template["pros"] + template["cons"]),
+            "summary_mode": template["summary"].get("summary_mode") or "abstractive"
+        },
+        "verdict": verdict == "SELECTED",
+        "pros": list(template["pros"]),
+        "cons": list(template["cons"])
+    }}
+
+
+def fill_store(store, count, results_per_report, templates):
+    start = datetime(2025, 1, 1)
+    rows = [
+        _report_row(f"meet_google_com_abc_{i % 50:03d}", (start + timedelta(minutes=i)).strftime('%Y%m%d_%H%M%S'),
+                    make_report(i, results_per_report, templates))
+        for i in range(count)
+    ]
+    store.add_reports(rows)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app, port):
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def run_load(url, requests, concurrency, headers):
+    latencies, sizes, statuses = [], [], {}
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker(session):
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            async with session.get(url, headers=headers, auto_decompress=False) as response:
+                body = await response.read()
+            latencies.append(time.perf_counter() - start)
+            sizes.append(len(body))
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        "bytes_per_response": round(sum(sizes) / len(sizes)),
+        "statuses": statuses
+    }
+
+
+async def probe_etag(url):
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as response:
+            return response.headers.get("ETag")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of the report API under local load")
+    parser.add_argument("--reports", type=int, default=500)
+    parser.add_argument("--results-per-report", type=int, default=40)
+    parser.add_argument("--templates", default=REPORT_FOLDER, help="Folder of real *_report.json files to scale up")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ReportStore(os.path.join(tmp, "reports.db"), import_from=None)
+        fill_store(store, args.reports, args.results_per_report, load_templates(args.templates))
+
+        import api_server
+        api_server.store = store
+
+        port = free_port()
+        server, thread = start_server(api_server.app, port)
+        base = f"http://127.0.0.1:{port}"
+        endpoints = {
+            "report": f"{base}/report?meeting_id=meet_google_com_abc_007",
+            "report_latest": f"{base}/report/latest",
+            "report_latest_compact": f"{base}/report/latest?compact=1",
+            "all_reports_page": f"{base}/all_reports?limit=50&sort=final_rating&order=desc",
+        }
+
+        results = {"reports": args.reports, "results_per_report": args.results_per_report,
+                   "requests": args.requests, "concurrency": args.concurrency, "endpoints": {}}
+        try:
+            for name, url in endpoints.items():
+                etag = asyncio.run(probe_etag(url))
+                results["endpoints"][name] = {
+                    "plain": asyncio.run(run_load(url, args.requests, args.concurrency, {"Accept-Encoding": "identity"})),
+                    "gzip": asyncio.run(run_load(url, args.requests, args.concurrency, {"Accept-Encoding": "gzip"})),
+                    "conditional": asyncio.run(run_load(url, args.requests, args.concurrency, {"If-None-Match": etag})),
+                }
+        finally:
+            server.should_exit = True
+            thread.join()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
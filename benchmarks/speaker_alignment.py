@@ -0,0 +1,82 @@
+# benchmarks/speaker_alignment.py
+# Micro-benchmark for speaker alignment: the sweep in
+# annotator.assign_speakers against the old scan over every diarization
+# turn per Whisper segment, on synthetic segment/turn lists.
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.annotator import assign_speakers
+
+
+def naive_assign_speakers(segments, turns):
+    speakers = []
+    for segment in segments:
+        speaker, max_overlap = None, 0
+        for turn_start, turn_end, label in turns:
+            overlap = max(0, min(segment["end"], turn_end) - max(segment["start"], turn_start))
+            if overlap > max_overlap:
+                max_overlap = overlap
+                speaker = label
+        speakers.append(speaker)
+    return speakers
+
+
+def synthetic_meeting(minutes, seed=0):
+    rng = random.Random(seed)
+    duration = minutes * 60
+    segments, turns = [], []
+
+    t = 0.0
+    while t < duration:
+        length = rng.uniform(1.0, 8.0)
+        segments.append({"start": t, "end": t + length, "text": "..."})
+        t += length + rng.uniform(0.0, 0.5)
+
+    t, speaker = 0.0, 0
+    while t < duration:
+        length = rng.uniform(0.5, 20.0)
+        # Small overlaps between turns, as pyannote produces for crosstalk
+        turns.append((max(0.0, t - rng.uniform(0.0, 0.3)), t + length, f"SPEAKER_{speaker:02d}"))
+        t += length
+        speaker = 1 - speaker
+
+    return segments, turns
+
+
+def best_of(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speaker alignment micro-benchmark")
+    parser.add_argument("--minutes", type=int, nargs="+", default=[5, 30, 90])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    for minutes in args.minutes:
+        segments, turns = synthetic_meeting(minutes)
+        assert assign_speakers(segments, turns) == naive_assign_speakers(segments, turns)
+        results.append({
+            "minutes": minutes,
+            "segments": len(segments),
+            "turns": len(turns),
+            "sweep_s": round(best_of(lambda: assign_speakers(segments, turns), args.runs), 4),
+            "naive_s": round(best_of(lambda: naive_assign_speakers(segments, turns), args.runs), 4)
+        })
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/startup.py
+# Measures how long app.py takes from launch until it could start polling
+# Gmail: importing app, starting the scheduler and the job worker pool
+# ("lazy"), vs the same plus loading every model up front ("eager", what the
+# old import-time loading did). The scheduler and job queue use throwaway
+# SQLite files and no invite sync is started, so nothing touches the network.
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Same steps as app.py's __main__ up to the point where invites would be checked
+LAZY = (
+    "import app; "
+    "app.scheduler.add_listener(app.on_job_missed, app.EVENT_JOB_MISSED); "
+    "app.scheduler.start(); "
+    "pool = app.JobWorkerPool().start(); "
+    "pool.stop(); app.scheduler.shutdown(wait=False)"
+)
+EAGER = LAZY.replace("app.scheduler.start(); ", "app.scheduler.start(); app.warm_up(); ")
+
+
+def time_snippet(code, runs):
+    timings = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            env = dict(os.environ,
+                       SCHEDULER_DB_URL=f"sqlite:///{os.path.join(workdir, 'scheduler_jobs.db')}",
+                       JOB_QUEUE_DB=os.path.join(workdir, "jobs.db"))
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--skip-eager", action="store_true", help="Don't load model weights")
+    args = parser.parse_args()
+
+    results = {"lazy_startup_s": round(time_snippet(LAZY, args.runs), 3)}
+    if not args.skip_eager:
+        results["eager_startup_s"] = round(time_snippet(EAGER, args.runs), 3)
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
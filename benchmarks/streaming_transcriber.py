@@ -0,0 +1,91 @@
+# benchmarks/streaming_transcriber.py
+# Regression check for utils/streamingTranscriber.py on a long silent stretch
+# (muted candidate, long pause): Whisper returns no segments, and the window
+# must still be dropped once it passes max_window_seconds instead of growing
+# for the rest of the interview. Also checks that a failing Whisper stops the
+# buffering and hands the recording to the offline pass. Uses stub Whispers,
+# so no weights are needed.
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.modelRegistry import register_model
+from utils.streamingTranscriber import StreamingTranscriber, WHISPER_SAMPLE_RATE
+
+
+class SilentWhisper:
+    # Finds nothing, like Whisper on silence; records how much audio each pass got
+    def __init__(self):
+        self.window_seconds = []
+
+    def transcribe(self, audio, **kwargs):
+        self.window_seconds.append(len(audio) / WHISPER_SAMPLE_RATE)
+        return {"segments": [], "text": ""}
+
+
+class BrokenWhisper:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        raise RuntimeError("CUDA out of memory")
+
+
+def feed_paced(transcriber, chunk, count):
+    for _ in range(count):
+        transcriber.feed(chunk, WHISPER_SAMPLE_RATE)
+        # Pace like a live recorder: the next chunk arrives after this one was picked up
+        while not transcriber._queue.empty():
+            time.sleep(0.0005)
+        time.sleep(0.002)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming transcriber window size on silence")
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--chunk-seconds", type=float, default=1.0)
+    parser.add_argument("--max-window-seconds", type=float, default=60.0)
+    args = parser.parse_args()
+
+    whisper = SilentWhisper()
+    register_model("bench-silent-whisper", lambda: whisper, 1)
+    transcriber = StreamingTranscriber("bench-silent-whisper", max_window_seconds=args.max_window_seconds)
+
+    chunk = np.zeros(int(args.chunk_seconds * WHISPER_SAMPLE_RATE), dtype=np.float32)
+    chunks = int(args.minutes * 60 / args.chunk_seconds)
+    start = time.perf_counter()
+    feed_paced(transcriber, chunk, chunks)
+    segments = transcriber.finish()
+    elapsed = time.perf_counter() - start
+
+    # A pass may see a full window plus a few chunks that queued while the previous
+    # pass ran; without the cut on silence it sees the whole recording so far
+    largest = max(whisper.window_seconds, default=0.0)
+    assert largest < 2 * args.max_window_seconds, \
+        f"window grew to {largest:.1f}s on silence (max_window_seconds={args.max_window_seconds})"
+    # Nothing transcribed: the caller falls back to the offline pass
+    assert segments is None
+
+    broken = BrokenWhisper()
+    register_model("bench-broken-whisper", lambda: broken, 1)
+    transcriber = StreamingTranscriber("bench-broken-whisper", max_window_seconds=args.max_window_seconds)
+    feed_paced(transcriber, chunk, chunks)
+    assert transcriber.finish() is None, "a failed stream must fall back to the offline pass"
+    assert broken.calls == 1 and len(transcriber._buffer) == 0, "a failed stream must stop buffering"
+
+    print(json.dumps({
+        "audio_seconds": args.minutes * 60,
+        "passes": len(whisper.window_seconds),
+        "largest_window_seconds": round(largest, 2),
+        "transcribed_seconds": round(sum(whisper.window_seconds), 1),
+        "elapsed_s": round(elapsed, 3)
+    }, indent=4))
+
+
+if __name__ == "__main__":
+    main()
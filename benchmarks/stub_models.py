@@ -0,0 +1,149 @@
+# benchmarks/stub_models.py
+# Weight-free stand-ins for the models in utils/modelRegistry, so the
+# pipeline benchmark runs in CI without downloads or a GPU. They keep the
+# call signatures the pipeline uses and do cheap but real work on their
+# input: Whisper and pyannote find utterances in the audio from frame energy
+# and pitch (benchmarks/synthetic_interview.py gives each speaker a
+# different pitch), the text models hash words.
+import re
+import sys
+import zlib
+import numpy as np
+import soundfile as sf
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.modelRegistry import register_model
+
+FRAME_LENGTH = 1024
+HOP_LENGTH = 512
+FRAMES_PER_BLOCK = 4096
+SILENCE_POWER = 1e-4
+# Between the two synthetic speakers' pitches (120 Hz and 220 Hz)
+PITCH_SPLIT_HZ = 170.0
+MAX_PITCH_HZ = 400.0
+MIN_RUN_FRAMES = 3
+
+POSITIVE_WORDS = {"excited", "love", "enjoy", "proud", "strengths", "clear", "calm", "reduced"}
+NEGATIVE_WORDS = {"not", "never", "difficult", "unsure", "badly"}
+
+
+def _mono_audio(audio, sample_rate=16000):
+    # Accepts what the pipeline hands to the models: a path, an array or
+    # pyannote's {"waveform": tensor, "sample_rate": sr}
+    if isinstance(audio, str):
+        audio, sample_rate = sf.read(audio, dtype="float32", always_2d=True)
+        return audio.mean(axis=1), sample_rate
+    if isinstance(audio, dict):
+        waveform = audio["waveform"]
+        waveform = waveform.numpy() if hasattr(waveform, "numpy") else np.asarray(waveform)
+        return np.asarray(waveform, dtype=np.float32).reshape(-1), audio["sample_rate"]
+    return np.asarray(audio, dtype=np.float32), sample_rate
+
+
+def _frame_labels(audio, sample_rate):
+    # -1 for silent frames, otherwise 0 (low pitch) or 1 (high pitch)
+    window = np.hanning(FRAME_LENGTH).astype(np.float32)
+    max_bin = int(MAX_PITCH_HZ * FRAME_LENGTH / sample_rate) + 1
+    labels = []
+    for block_start in range(0, len(audio), HOP_LENGTH * FRAMES_PER_BLOCK):
+        block = audio[block_start:block_start + HOP_LENGTH * (FRAMES_PER_BLOCK - 1) + FRAME_LENGTH]
+        if len(block) < FRAME_LENGTH:
+            break
+        frames = sliding_window_view(block, FRAME_LENGTH)[::HOP_LENGTH]
+        power = np.square(frames).mean(axis=1)
+        spectrum = np.abs(np.fft.rfft(frames * window, axis=1)[:, 1:max_bin])
+        pitch_hz = (spectrum.argmax(axis=1) + 1) * sample_rate / FRAME_LENGTH
+        block_labels = (pitch_hz >= PITCH_SPLIT_HZ).astype(np.int8)
+        block_labels[power < SILENCE_POWER] = -1
+        labels.append(block_labels)
+    return np.concatenate(labels) if labels else np.zeros(0, dtype=np.int8)
+
+
+def speaker_runs(audio, sample_rate=16000):
+    # [(start_s, end_s, "SPEAKER_00" | "SPEAKER_01"), ...], one per utterance
+    audio, sample_rate = _mono_audio(audio, sample_rate)
+    labels = _frame_labels(audio, sample_rate)
+    voiced = np.flatnonzero(labels >= 0)
+    if not len(voiced):
+        return []
+
+    voiced_labels = labels[voiced]
+    bounds = np.concatenate([[0], np.flatnonzero(np.diff(voiced_labels)) + 1, [len(voiced)]])
+    runs = []
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        if b - a < MIN_RUN_FRAMES:
+            continue  # a few frames straddling a turn change
+        label = int(voiced_labels[a])
+        if runs and runs[-1][2] == label:
+            runs[-1][1] = voiced[b - 1]
+        else:
+            runs.append([voiced[a], voiced[b - 1], label])
+
+    return [(round(start * HOP_LENGTH / sample_rate, 3),
+             round((end * HOP_LENGTH + FRAME_LENGTH) / sample_rate, 3),
+             f"SPEAKER_{label:02d}") for start, end, label in runs]
+
+
+class StubWhisper:
+    # One segment per utterance found in the audio, with the script's text
+    def __init__(self, texts):
+        self.texts = list(texts)
+
+    def transcribe(self, audio, **kwargs):
+        runs = speaker_runs(audio)
+        if len(runs) != len(self.texts):
+            print(f"⚠️ Stub Whisper found {len(runs)} utterances, script has {len(self.texts)}", file=sys.stderr)
+        segments = [{"id": i, "start": start, "end": end, "text": " " + (self.texts[i] if i < len(self.texts) else "")}
+                    for i, (start, end, _) in enumerate(runs)]
+        return {"segments": segments, "text": "".join(s["text"] for s in segments)}
+
+
+class StubDiarization:
+    # Returns turn tuples, which annotate_transcript accepts in place of an Annotation
+    def __call__(self, audio):
+        return speaker_runs(audio)
+
+
+class StubEmbedding:
+    # Hashed bag of words, same width as all-MiniLM-L6-v2
+    dimensions = 384
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=True, **kwargs):
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                vectors[i, zlib.crc32(word.encode()) % self.dimensions] += 1.0
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+
+class StubSentiment:
+    # Keyword vote with the cardiffnlp label names
+    def __call__(self, texts, **kwargs):
+        texts = [texts] if isinstance(texts, str) else texts
+        outputs = []
+        for text in texts:
+            words = set(re.findall(r"\w+", text.lower()))
+            score = len(words & POSITIVE_WORDS) - len(words & NEGATIVE_WORDS)
+            label = "LABEL_2" if score > 0 else "LABEL_0" if score < 0 else "LABEL_1"
+            outputs.append({"label": label, "score": 0.9})
+        return outputs
+
+
+class StubSummarizer:
+    # Leading words of the input, roughly max_length tokens
+    def __call__(self, texts, max_length=60, **kwargs):
+        texts = [texts] if isinstance(texts, str) else texts
+        return [{"summary_text": " ".join(text.split()[:max(8, max_length // 2)])} for text in texts]
+
+
+def install_stub_models(script):
+    # script: [{"text", ...}, ...] from synthesize_interview, in speaking order
+    whisper = StubWhisper(line["text"] for line in script)
+    register_model("whisper-tiny", lambda: whisper, 1)
+    register_model("whisper-base", lambda: whisper, 1)
+    register_model("diarization", StubDiarization, 1)
+    register_model("embedding", StubEmbedding, 1)
+    register_model("sentiment", StubSentiment, 1)
+    register_model("summarizer", StubSummarizer, 1)
@@ -3,7 +3,7 @@
 import os
 import json
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from sentence_transformers import SentenceTransformer, util
+from utils.embeddings import pairwise_similarities
 
 def load_annotated_transcript(file_path):
     with open(file_path, 'r') as file:
@@ -20,27 +20,27 @@ def analyse_transcript(transcript_path):
     dialogue = load_annotated_transcript(transcript_path)
     
     sentiment_analyzer = SentimentIntensityAnalyzer()
-    model = SentenceTransformer('all-MiniLM-L6-v2')
 
-    results = []
+    pairs = []
     last_question = None
 
     for speaker, content in dialogue:
         if speaker.lower() == 'interviewer':
             last_question = content
         elif speaker.lower() == 'candidate' and last_question:
-            sentiment = sentiment_analyzer.polarity_scores(content)
-            relevance = util.pytorch_cos_sim(
-                model.encode(last_question),
-                model.encode(content)
-            ).item()
-
-            results.append({
-                "question": last_question,
-                "answer": content,
-                "sentiment": sentiment,
-                "relevance": relevance
-            })
+            pairs.append((last_question, content))
+
+    # Encode every question and answer in two batched calls
+    relevances = pairwise_similarities([q for q, _ in pairs], [a for _, a in pairs])
+
+    results = []
+    for (question, answer), relevance in zip(pairs, relevances):
+        results.append({
+            "question": question,
+            "answer": answer,
+            "sentiment": sentiment_analyzer.polarity_scores(answer),
+            "relevance": float(relevance)
+        })
 
     # Save results
     result_path = transcript_path.replace(".txt", "_analysis.json")
@@ -1,104 +1,187 @@
 import os
-import whisper
 import soundfile as sf
-import librosa
 import numpy as np
 import re
-from dotenv import load_dotenv
-from pyannote.audio import Pipeline
+import json
+import heapq
+import tempfile
+import time
 from datetime import timedelta
+from utils.modelRegistry import get_model
+from utils.streamingVad import remove_silence_streaming
+from utils.enginePool import transcribe_and_diarize
 
-load_dotenv()
-HUGGINGFACE_TOKEN = os.getenv("HUGGINGFACE_TOKEN")
+SAMPLE_RATE = 16000
 
 # Silence removal
-def remove_silence(audio_path, output_path, threshold_db=-60, frame_length=2048, hop_length=512):
+def load_without_silence(audio_path, threshold_db=-60, frame_length=2048, hop_length=512):
+    # -> (trimmed 16 kHz mono float32 audio, sample rate) or None on failure
     try:
-        y, sr = librosa.load(audio_path, sr=16000)
+        import librosa  # Deferred: pulls in numba and takes seconds to import
+        y, sr = librosa.load(audio_path, sr=SAMPLE_RATE)
         intervals = librosa.effects.split(y, top_db=threshold_db, frame_length=frame_length, hop_length=hop_length)
         if len(intervals) > 0:
-            trimmed_audio = np.concatenate([y[i[0]:i[1]] for i in intervals])
-            sf.write(output_path, trimmed_audio, sr)
-        else:
-            sf.write(output_path, y, sr)
+            y = np.concatenate([y[i[0]:i[1]] for i in intervals])
+    except Exception as e:
+        print(f"Error removing silence: {e}")
+        return None
+    return y, sr
+
+def remove_silence(audio_path, output_path, threshold_db=-60, frame_length=2048, hop_length=512):
+    loaded = load_without_silence(audio_path, threshold_db, frame_length, hop_length)
+    if loaded is None:
+        return False
+    try:
+        sf.write(output_path, loaded[0], loaded[1])
     except Exception as e:
         print(f"Error removing silence: {e}")
         return False
     return True
 
 # Transcription
-def transcribe_with_whisper(audio_path):
+def transcribe_with_whisper(audio):
+    # audio: a file path or a 16 kHz mono float32 array
     print("📝 Transcribing with Whisper...")
     try:
-        model = whisper.load_model("tiny")
-        result = model.transcribe(audio_path, word_timestamps=False)
+        model = get_model("whisper-tiny")
+        result = model.transcribe(audio, word_timestamps=False)
         return result["segments"]
     except Exception as e:
         print(f"Error during transcription: {e}")
         return None
 
 # Diarization with pyannote
-def diarize_speakers(audio_path):
+def diarize_speakers(audio, sample_rate=SAMPLE_RATE):
+    # audio: a file path or a mono float32 array at sample_rate
     print("🔍 Performing speaker diarization...")
     try:
-        pipeline = Pipeline.from_pretrained("pyannote/speaker-diarization", use_auth_token=HUGGINGFACE_TOKEN)
-        diarization = pipeline(audio_path)
+        pipeline = get_model("diarization")
+        if isinstance(audio, np.ndarray):
+            import torch
+            audio = {"waveform": torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32))[None, :], "sample_rate": sample_rate}
+        diarization = pipeline(audio)
         return diarization
     except Exception as e:
         print(f"Error during diarization: {e}")
         return None
 
 # Align speaker labels with transcription
+def diarization_turns(diarization):
+    # pyannote Annotation -> [(start, end, label), ...]; lists pass through
+    if isinstance(diarization, list):
+        return diarization
+    return [(turn.start, turn.end, label) for turn, _, label in diarization.itertracks(yield_label=True)]
+
+def assign_speakers(segments, turns):
+    # Max-overlap turn label for every segment in one sweep over both lists.
+    # Ties go to the earliest turn, like a full scan over the turns would.
+    speakers = [None] * len(segments)
+    turn_order = sorted(range(len(turns)), key=lambda t: turns[t][0])
+    segment_order = sorted(range(len(segments)), key=lambda i: segments[i]["start"])
+
+    active = []  # heap of (turn end, turn index) for turns that may still overlap
+    next_turn = 0
+    for i in segment_order:
+        seg_start = segments[i]["start"]
+        seg_end = segments[i]["end"]
+
+        while next_turn < len(turn_order) and turns[turn_order[next_turn]][0] < seg_end:
+            t = turn_order[next_turn]
+            heapq.heappush(active, (turns[t][1], t))
+            next_turn += 1
+        while active and active[0][0] <= seg_start:
+            heapq.heappop(active)
+
+        max_overlap = 0
+        for t in sorted(t for _, t in active):
+            turn_start, turn_end, label = turns[t]
+            overlap = min(seg_end, turn_end) - max(seg_start, turn_start)
+            if overlap > max_overlap:
+                max_overlap = overlap
+                speakers[i] = label
+
+    return speakers
+
 def annotate_transcript(segments, diarization):
     label_map = {
         "SPEAKER_00": "Interviewer",
         "SPEAKER_01": "Candidate"
     }
 
-    annotated_text = ""
-
-    for segment in segments:
-        seg_start = segment["start"]
-        seg_end = segment["end"]
-        seg_text = segment["text"].strip()
-
-        speaker_label = "Unknown"
-        max_overlap = 0
-
-        for turn, _, label in diarization.itertracks(yield_label=True):
-            turn_start = turn.start
-            turn_end = turn.end
+    speakers = assign_speakers(segments, diarization_turns(diarization))
 
-            # Calculate overlap duration
-            overlap_start = max(seg_start, turn_start)
-            overlap_end = min(seg_end, turn_end)
-            overlap = max(0, overlap_end - overlap_start)
+    lines = []
+    for segment, speaker in zip(segments, speakers):
+        speaker_label = label_map.get(speaker, "Unknown")
+        lines.append(f"{speaker_label}: {segment['text'].strip()}\n")
 
-            if overlap > max_overlap:
-                max_overlap = overlap
-                speaker_label = label_map.get(label, "Unknown")
-
-        annotated_text += f"{speaker_label}: {seg_text}\n"
+    return "".join(lines)
 
-    return annotated_text
 
+# "librosa" loads the whole recording, "streaming" works block by block
+VAD_MODE = os.getenv("VAD_MODE", "librosa")
+# Run Whisper and pyannote concurrently in separate worker processes
+PARALLEL_TRANSCRIPTION = os.getenv("PARALLEL_TRANSCRIPTION") == "1"
 
 # Main flow
-def transcribe_audio(audio_path):
-    print("✂️ Removing silence...")
-    temp_silent_removed = "silent_removed.wav"
-    if not remove_silence(audio_path, temp_silent_removed):
-        print("Silence removal failed. Continuing with original audio.")
-        temp_silent_removed = audio_path
-
-    segments = transcribe_with_whisper(temp_silent_removed)
-    diarization = diarize_speakers(temp_silent_removed)
-
-    if temp_silent_removed != audio_path:
-        os.remove(temp_silent_removed)
+def transcribe_audio(audio_path, segments=None, vad_mode=None, parallel=None, timings=None):
+    # segments: Whisper segments already produced while recording
+    # (StreamingTranscriber). They are timed against the original recording,
+    # so diarization runs on it as well instead of the silence-trimmed copy.
+    # timings: optional dict that receives the wall-clock seconds per stage.
+    vad_mode = vad_mode or VAD_MODE
+    parallel = PARALLEL_TRANSCRIPTION if parallel is None else parallel
+    timings = {} if timings is None else timings
+    voiced_intervals = None
+    pipeline_start = time.perf_counter()
+
+    if segments is not None:
+        stage_start = time.perf_counter()
+        diarization = diarize_speakers(audio_path)
+        timings["diarization"] = time.perf_counter() - stage_start
+    else:
+        print("✂️ Removing silence...")
+        stage_start = time.perf_counter()
+        temp_silent_removed = None
+        try:
+            if vad_mode == "streaming":
+                # Bounded-memory path still goes through a file, but a private one
+                fd, temp_silent_removed = tempfile.mkstemp(suffix=".wav")
+                os.close(fd)
+                voiced_intervals = remove_silence_streaming(audio_path, temp_silent_removed)
+                audio = temp_silent_removed if voiced_intervals is not None else None
+            else:
+                # Trimmed samples go straight to Whisper and pyannote, no re-decoding
+                loaded = load_without_silence(audio_path)
+                audio = loaded[0] if loaded is not None else None
+
+            if audio is None:
+                print("Silence removal failed. Continuing with original audio.")
+                audio = audio_path
+            timings["silence_removal"] = time.perf_counter() - stage_start
+
+            if parallel:
+                segments, diarization, engine_timings = transcribe_and_diarize(audio, SAMPLE_RATE)
+                timings.update(engine_timings)
+            else:
+                stage_start = time.perf_counter()
+                segments = transcribe_with_whisper(audio)
+                timings["whisper"] = time.perf_counter() - stage_start
+
+                stage_start = time.perf_counter()
+                diarization = diarize_speakers(audio)
+                timings["diarization"] = time.perf_counter() - stage_start
+        finally:
+            # Also on failure, so failed and retried jobs don't leave files in /tmp
+            if temp_silent_removed:
+                os.remove(temp_silent_removed)
 
     if segments and diarization:
+        stage_start = time.perf_counter()
         annotated_text = annotate_transcript(segments, diarization)
+        timings["annotation"] = time.perf_counter() - stage_start
+        timings["total"] = time.perf_counter() - pipeline_start
+        print("⏱️ Stage timings:", {stage: round(seconds, 2) for stage, seconds in timings.items()})
 
         os.makedirs("recordings", exist_ok=True)
         base_name = os.path.splitext(os.path.basename(audio_path))[0]
@@ -107,6 +190,11 @@ def transcribe_audio(audio_path):
         with open(transcript_path, "w") as f:
             f.write(annotated_text)
 
+        if voiced_intervals is not None:
+            # Lets transcript times in the trimmed audio be mapped back with to_original_time
+            with open(os.path.join("recordings", f"{base_name}_voiced_intervals.json"), "w") as f:
+                json.dump(voiced_intervals, f)
+
         print(f"\n✅ Annotated transcript saved to: {transcript_path}\n")
         print(annotated_text)
         return transcript_path
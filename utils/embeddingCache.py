@@ -0,0 +1,147 @@
+# utils/embeddingCache.py
+# On-disk cache of sentence embeddings so recurring interview questions are
+# only embedded once. Vectors are stored as float16 blobs in a SQLite (WAL)
+# table keyed by sha1(model name + normalized text), so the job workers and
+# engine processes can read and write the same cache at once.
+import os
+import re
+import time
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join("cache", "embeddings"))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS embeddings_lru ON embeddings (last_used);
+"""
+
+# SQLite's default limit on host parameters in one statement is 999
+_LOOKUP_BATCH = 500
+
+
+def normalize_text(text):
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def cache_key(model_name, text):
+    return hashlib.sha1(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, cache_dir=EMBEDDING_CACHE_DIR, max_entries=EMBEDDING_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.db_path = os.path.join(cache_dir, "embeddings.db")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        # One connection per cache object, opened on first use; callers hold self._lock
+        if self._conn is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, model_name, texts):
+        # -> {position in texts: float32 vector} for every cached text
+        positions = {}
+        for i, text in enumerate(texts):
+            positions.setdefault(cache_key(model_name, text), []).append(i)
+        keys = list(positions)
+
+        found = {}
+        with self._lock:
+            conn = self._connection()
+            rows = []
+            for start in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[start:start + _LOOKUP_BATCH]
+                rows += conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({', '.join('?' * len(batch))})", batch
+                ).fetchall()
+            if rows:
+                now = time.time()
+                with conn:
+                    conn.execute("BEGIN")
+                    conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key, _ in rows])
+
+            for key, blob in rows:
+                vector = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+                for i in positions[key]:
+                    found[i] = vector
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, model_name, texts, vectors):
+        vectors = np.asarray(vectors)
+        if len(texts) == 0 or self.max_entries <= 0:
+            return
+        now = time.time()
+        rows = [(cache_key(model_name, text), vector.astype(np.float16).tobytes(), now)
+                for text, vector in zip(texts, vectors)]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                # IMMEDIATE takes the write lock up front, so the count and the
+                # eviction below see every other process's inserts
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows)
+                excess = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    # Least recently used first, straight off the last_used index
+                    conn.execute(
+                        "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                        (excess,)
+                    )
+                    self.evictions += excess
+
+    def stats(self):
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN")
+                conn.execute("DELETE FROM embeddings")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_embedding_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache()
+        return _cache
+
+
+def use_embedding_cache(cache_dir):
+    # Points get_embedding_cache() at another directory, e.g. a fresh one per benchmark run
+    global _cache
+    with _cache_lock:
+        _cache = EmbeddingCache(cache_dir)
+        return _cache
@@ -0,0 +1,49 @@
+# utils/embeddings.py
+# Batched sentence embeddings and question/answer similarity shared by the
+# report generator and the transcript analyser.
+import numpy as np
+from utils.modelRegistry import get_model, EMBEDDING_MODEL_NAME
+from utils.embeddingCache import get_embedding_cache, normalize_text
+
+
+def encode_texts(texts, use_cache=True):
+    # One batched encode call -> (len(texts), dim) array of unit-length rows.
+    # Texts already in the on-disk cache are not sent to the model.
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    cache = get_embedding_cache() if use_cache else None
+    cached = cache.get_many(EMBEDDING_MODEL_NAME, texts) if cache else {}
+
+    # Texts that only differ in case/whitespace are encoded once
+    missing = {}
+    for i, text in enumerate(texts):
+        if i not in cached:
+            missing.setdefault(normalize_text(text), text)
+
+    encoded = {}
+    if missing:
+        model = get_model("embedding")
+        to_encode = list(missing.values())
+        vectors = np.asarray(model.encode(to_encode, convert_to_numpy=True, normalize_embeddings=True), dtype=np.float32)
+        encoded = dict(zip(missing, vectors))
+        if cache:
+            cache.put_many(EMBEDDING_MODEL_NAME, to_encode, vectors)
+
+    return np.stack([cached[i] if i in cached else encoded[normalize_text(text)] for i, text in enumerate(texts)])
+
+
+def embedding_cache_stats():
+    return get_embedding_cache().stats()
+
+
+def pairwise_similarities(questions, answers):
+    # Cosine similarity of questions[i] with answers[i] for every pair at once
+    if len(questions) != len(answers):
+        raise ValueError("questions and answers must have the same length")
+    if not questions:
+        return np.zeros(0, dtype=np.float32)
+
+    question_embeddings = encode_texts(questions)
+    answer_embeddings = encode_texts(answers)
+    return np.einsum("ij,ij->i", question_embeddings, answer_embeddings)
@@ -0,0 +1,103 @@
+# utils/enginePool.py
+# Runs Whisper and pyannote at the same time in two long-lived worker
+# processes. Each engine gets its own process (so models stay warm between
+# meetings) and its own thread budget, so together they don't oversubscribe
+# the cores.
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_cpus = os.cpu_count() or 2
+WHISPER_THREADS = int(os.getenv("WHISPER_THREADS", str(max(1, _cpus // 2))))
+DIARIZATION_THREADS = int(os.getenv("DIARIZATION_THREADS", str(max(1, _cpus - _cpus // 2))))
+
+# (engine, thread count) -> single-worker pool
+_executors = {}
+_lock = threading.Lock()
+
+
+def _init_worker(num_threads):
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    os.environ["MKL_NUM_THREADS"] = str(num_threads)
+    import torch
+    torch.set_num_threads(num_threads)
+
+
+def _get_executor(engine, num_threads):
+    key = (engine, num_threads)
+    with _lock:
+        if key not in _executors:
+            _executors[key] = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(num_threads,)
+            )
+        return _executors[key]
+
+
+def _discard_executor(executor):
+    # A worker that died (e.g. OOM) leaves its pool broken for good; the next call starts a new one
+    with _lock:
+        for key, cached in list(_executors.items()):
+            if cached is executor:
+                del _executors[key]
+    executor.shutdown(wait=False)
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def _whisper_job(audio):
+    from utils.annotator import transcribe_with_whisper
+    return _timed(transcribe_with_whisper, audio)
+
+
+def _diarization_job(audio, sample_rate):
+    from utils.annotator import diarize_speakers, diarization_turns
+    diarization, elapsed = _timed(diarize_speakers, audio, sample_rate)
+    # Plain (start, end, label) tuples pickle cheaply back to the parent
+    return (diarization_turns(diarization) if diarization else None), elapsed
+
+
+def _submit(engine, num_threads, fn, *args):
+    executor = _get_executor(engine, num_threads)
+    try:
+        return executor, executor.submit(fn, *args)
+    except BrokenProcessPool:
+        # Broken since the last call; nothing ran yet, so retry once on a fresh worker
+        _discard_executor(executor)
+        executor = _get_executor(engine, num_threads)
+        return executor, executor.submit(fn, *args)
+
+
+def _result(executor, future):
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        raise
+
+
+def transcribe_and_diarize(audio, sample_rate, whisper_threads=None, diarization_threads=None):
+    # -> (segments, turns, {"whisper": s, "diarization": s}) with both engines
+    # running concurrently
+    whisper = _submit("whisper", whisper_threads or WHISPER_THREADS, _whisper_job, audio)
+    diarization = _submit("diarization", diarization_threads or DIARIZATION_THREADS, _diarization_job, audio, sample_rate)
+
+    segments, whisper_seconds = _result(*whisper)
+    turns, diarization_seconds = _result(*diarization)
+    return segments, turns, {"whisper": whisper_seconds, "diarization": diarization_seconds}
+
+
+def shutdown():
+    with _lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=True)
+        _executors.clear()
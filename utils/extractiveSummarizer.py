@@ -0,0 +1,49 @@
+# utils/extractiveSummarizer.py
+# Model-free summarizer for low-latency runs: scores sentences by the
+# frequency of the words they contain and keeps the best ones in order.
+import re
+import numpy as np
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "had", "has", "have",
+    "i", "in", "is", "it", "its", "me", "my", "of", "on", "or", "so", "that", "the", "their",
+    "them", "then", "there", "they", "this", "to", "was", "we", "were", "what", "when", "which",
+    "with", "you", "your", "also", "very", "just", "really", "did", "do", "does", "been"
+}
+
+
+def split_sentences(text):
+    return [s.strip() for s in re.split(r'(?<=[.!?])\s+', text.strip()) if s.strip()]
+
+
+def _tokenize(sentence):
+    return [w for w in re.findall(r"[a-z0-9']+", sentence.lower()) if w not in STOPWORDS]
+
+
+def summarize(text, max_sentences=2):
+    sentences = split_sentences(text)
+    if len(sentences) <= max_sentences:
+        return " ".join(sentences)
+
+    tokens = [_tokenize(s) for s in sentences]
+    vocab = {w: i for i, w in enumerate(sorted({w for t in tokens for w in t}))}
+    if not vocab:
+        return " ".join(sentences[:max_sentences])
+
+    # sentence x word count matrix
+    counts = np.zeros((len(sentences), len(vocab)), dtype=np.float32)
+    for row, words in enumerate(tokens):
+        for w in words:
+            counts[row, vocab[w]] += 1
+
+    word_weights = counts.sum(axis=0)
+    word_weights /= word_weights.max()
+    lengths = np.maximum(counts.sum(axis=1), 1)
+    scores = counts @ word_weights / np.sqrt(lengths)
+
+    best = np.sort(np.argsort(-scores, kind="stable")[:max_sentences])
+    return " ".join(sentences[i] for i in best)
+
+
+def summarize_many(texts, max_sentences=2):
+    return [summarize(text, max_sentences) for text in texts]
@@ -0,0 +1,216 @@
+# utils/inviteSync.py
+# Incremental Gmail invite sync. Remembers UIDVALIDITY and the last UID it
+# has looked at, fetches only the Subject header of new unread mail in one
+# batched FETCH, downloads full messages only for meeting invites (marking
+# them read once they are scheduled), and then waits on IMAP IDLE so new
+# invites are scheduled as soon as they arrive.
+import os
+import re
+import json
+import ssl
+import time
+import email
+import select
+import imaplib
+from email.header import decode_header, make_header
+
+IMAP_HOST = os.getenv("IMAP_HOST", "imap.gmail.com")
+IMAP_PORT = int(os.getenv("IMAP_PORT", "993"))
+IMAP_SSL = os.getenv("IMAP_SSL", "1") == "1"
+INVITE_SYNC_STATE = os.getenv("INVITE_SYNC_STATE", "invite_sync_state.json")
+# RFC 2177: re-issue IDLE before the server's 30 minute inactivity timeout
+IDLE_SECONDS = 29 * 60
+
+
+def is_meeting_subject(subject):
+    return bool(subject) and ("interview" in subject.lower() or "meeting" in subject.lower())
+
+
+def _decode_subject(raw_header):
+    subject = email.message_from_bytes(raw_header).get("subject")
+    if subject is None:
+        return None
+    try:
+        return str(make_header(decode_header(subject)))
+    except Exception:
+        return subject
+
+
+def _fetched_parts(data):
+    # UID FETCH response -> {uid: literal bytes}
+    parts = {}
+    for item in data:
+        if isinstance(item, tuple):
+            match = re.search(rb"UID (\d+)", item[0])
+            if match:
+                parts[int(match.group(1))] = item[1]
+    return parts
+
+
+class InviteSync:
+    def __init__(self, account, password, on_invites, host=IMAP_HOST, port=IMAP_PORT, use_ssl=IMAP_SSL,
+                 state_path=INVITE_SYNC_STATE, subject_filter=is_meeting_subject, mailbox="inbox"):
+        # on_invites(messages) gets the full email.message.Message of every new invite, one per call;
+        # an invite is marked read only once on_invites returns for it
+        self.account = account
+        self.password = password
+        self.on_invites = on_invites
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.state_path = state_path
+        self.subject_filter = subject_filter
+        self.mailbox = mailbox
+        self.mail = None
+        self.state = self._load_state()
+
+    def _load_state(self):
+        if self.state_path and os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, "r") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable invite sync state: {e}")
+        return {"uidvalidity": None, "last_uid": 0}
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def connect(self):
+        print("📧 Logging into Gmail...")
+        if self.use_ssl:
+            self.mail = imaplib.IMAP4_SSL(self.host, self.port)
+        else:
+            self.mail = imaplib.IMAP4(self.host, self.port)
+        self.mail.login(self.account, self.password)
+        self.mail.select(self.mailbox)
+
+        uidvalidity = int(self.mail.response("UIDVALIDITY")[1][0])
+        if uidvalidity != self.state["uidvalidity"]:
+            # UIDs from another mailbox generation mean nothing here; start over
+            self.state = {"uidvalidity": uidvalidity, "last_uid": 0}
+            self._save_state()
+
+    def close(self):
+        if self.mail:
+            try:
+                self.mail.logout()
+            except Exception:
+                pass
+            self.mail = None
+
+    def sync(self):
+        # Returns the number of invites on_invites handled
+        last_uid = self.state["last_uid"]
+        # The search below covers anything announced so far; EXISTS that arrives
+        # during this sync's commands is left for idle() to pick up
+        self.mail.response("EXISTS")
+        _, data = self.mail.uid("SEARCH", "UNSEEN", "UID", f"{last_uid + 1}:*")
+        # "n:*" always matches the highest UID, even when it is below n
+        uids = [uid for uid in map(int, data[0].split()) if uid > last_uid]
+        if not uids:
+            return 0
+
+        uid_set = ",".join(map(str, uids))
+        _, data = self.mail.uid("FETCH", uid_set, "(BODY.PEEK[HEADER.FIELDS (SUBJECT)])")
+        headers = _fetched_parts(data)
+        matching = [uid for uid in uids if self.subject_filter(_decode_subject(headers.get(uid, b"")))]
+
+        handled = set(uids) - set(matching)
+        if matching:
+            # PEEK leaves the invites unread until they are scheduled, so a failure is retried next sync
+            _, data = self.mail.uid("FETCH", ",".join(map(str, matching)), "(BODY.PEEK[])")
+            bodies = _fetched_parts(data)
+            for uid in matching:
+                if uid not in bodies:
+                    continue
+                try:
+                    # One invite per call, so a malformed one can't take the rest of the batch with it
+                    self.on_invites([email.message_from_bytes(bodies[uid])])
+                except Exception as e:
+                    print(f"❌ Failed to schedule invite (UID {uid}), will retry: {e}")
+                    continue
+                handled.add(uid)
+            scheduled = sorted(handled.intersection(matching))
+            if scheduled:
+                self.mail.uid("STORE", ",".join(map(str, scheduled)), "+FLAGS", "(\\Seen)")
+
+        # Only move past UIDs that are done; a failed invite stays unread and above last_uid
+        unhandled = [uid for uid in uids if uid not in handled]
+        self.state["last_uid"] = min(unhandled) - 1 if unhandled else max(uids)
+        self._save_state()
+        return len(handled.intersection(matching))
+
+    def _has_buffered_data(self):
+        # True if a response is already sitting in imaplib's read buffer (or the
+        # TLS layer), where select() on the socket can't see it
+        sock = self.mail.sock
+        timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            return bool(self.mail.file.peek(1))
+        except (BlockingIOError, ssl.SSLWantReadError):
+            return False
+        finally:
+            sock.settimeout(timeout)
+
+    def idle(self, timeout=IDLE_SECONDS):
+        # Blocks until the server reports new mail or timeout passes; True on new mail
+        if self.mail.response("EXISTS")[1][0] is not None:
+            # Announced alongside an earlier command's responses
+            return True
+
+        tag = self.mail._new_tag()
+        self.mail.send(tag + b" IDLE\r\n")
+        line = self.mail.readline()
+        if not line.startswith(b"+"):
+            raise imaplib.IMAP4.error(f"IDLE not accepted: {line!r}")
+
+        new_mail = False
+        deadline = time.monotonic() + timeout
+        try:
+            while not new_mail:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if not self._has_buffered_data() and not select.select([self.mail.sock], [], [], remaining)[0]:
+                    break
+                line = self.mail.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("connection closed during IDLE")
+                new_mail = line.rstrip().endswith(b"EXISTS")
+        finally:
+            self.mail.send(b"DONE\r\n")
+            while True:
+                line = self.mail.readline()
+                if not line or line.startswith(tag):
+                    break
+                # Mail that arrived while we were ending IDLE
+                new_mail = new_mail or line.rstrip().endswith(b"EXISTS")
+        return new_mail
+
+    def watch(self, stop_event=None, reconnect_delay=30, idle_seconds=IDLE_SECONDS):
+        # Sync, then IDLE and sync again, forever; reconnects on errors
+        while stop_event is None or not stop_event.is_set():
+            try:
+                self.connect()
+                self.sync()
+                while stop_event is None or not stop_event.is_set():
+                    # Sync after every round, timeouts included: mail that lands between
+                    # the last search and IDLE starting is not always announced during
+                    # IDLE, and the search doubles as the keep-alive
+                    self.idle(idle_seconds)
+                    self.sync()
+            except Exception as e:
+                print(f"❌ Invite sync error, reconnecting in {reconnect_delay}s: {e}")
+                self.close()
+                if stop_event is not None:
+                    stop_event.wait(reconnect_delay)
+                else:
+                    time.sleep(reconnect_delay)
+        self.close()
@@ -0,0 +1,290 @@
+# utils/jobQueue.py
+# Durable queue for post-meeting "recording -> transcript -> report" jobs.
+# Jobs live in a local SQLite file so they survive restarts of app.py, and
+# a bounded process pool works through them by priority with retries.
+import os
+import json
+import time
+import sqlite3
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+JOB_QUEUE_DB = os.getenv("JOB_QUEUE_DB", "jobs.db")
+PROCESSING_WORKERS = int(os.getenv("PROCESSING_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+RETRY_BACKOFF_SECONDS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    audio_path TEXT NOT NULL,
+    meeting_link TEXT NOT NULL,
+    segments_path TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    transcript_path TEXT,
+    verdict TEXT,
+    final_rating REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, priority DESC, id);
+"""
+
+
+def _connect(db_path=None):
+    conn = sqlite3.connect(db_path or JOB_QUEUE_DB, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def enqueue_job(audio_path, meeting_link, priority=0, segments=None, max_attempts=None, db_path=None):
+    # segments: Whisper segments from streaming transcription, kept next to the recording
+    segments_path = None
+    if segments is not None:
+        segments_path = os.path.splitext(audio_path)[0] + "_segments.json"
+        with open(segments_path, "w") as f:
+            json.dump(segments, f)
+
+    now = time.time()
+    conn = _connect(db_path)
+    try:
+        cursor = conn.execute(
+            "INSERT INTO jobs (audio_path, meeting_link, segments_path, priority, max_attempts, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (audio_path, meeting_link, segments_path, priority, max_attempts or JOB_MAX_ATTEMPTS, now, now)
+        )
+        job_id = cursor.lastrowid
+    finally:
+        conn.close()
+    print(f"🗂️ Queued job {job_id} for {meeting_link} (priority {priority})")
+    return job_id
+
+
+def claim_next_job(db_path=None):
+    # Atomically moves the highest-priority due job to 'running'
+    conn = _connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT * FROM jobs WHERE status = 'queued' AND next_attempt_at <= ? "
+            "ORDER BY priority DESC, id LIMIT 1",
+            (time.time(),)
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute(
+            "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+            (time.time(), row["id"])
+        )
+        conn.execute("COMMIT")
+        return dict(row)
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def complete_job(job_id, transcript_path, verdict, final_rating, db_path=None):
+    conn = _connect(db_path)
+    try:
+        conn.execute(
+            "UPDATE jobs SET status = 'done', error = NULL, transcript_path = ?, verdict = ?, final_rating = ?, updated_at = ? WHERE id = ?",
+            (transcript_path, verdict, final_rating, time.time(), job_id)
+        )
+    finally:
+        conn.close()
+
+
+def fail_job(job_id, error, db_path=None):
+    # Requeues with a linear backoff until max_attempts is used up
+    conn = _connect(db_path)
+    try:
+        row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        now = time.time()
+        if row and row["attempts"] < row["max_attempts"]:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', error = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                (error, now + RETRY_BACKOFF_SECONDS * row["attempts"], now, job_id)
+            )
+        else:
+            conn.execute("UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?", (error, now, job_id))
+    finally:
+        conn.close()
+
+
+def requeue_job(job_id, db_path=None):
+    # Puts a claimed job back without counting the attempt, for jobs that never got to run
+    conn = _connect(db_path)
+    try:
+        conn.execute(
+            "UPDATE jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), updated_at = ? WHERE id = ?",
+            (time.time(), job_id)
+        )
+    finally:
+        conn.close()
+
+
+def recover_jobs(db_path=None):
+    # Jobs left 'running' by a previous process never finished; run them again,
+    # unless they have used up their attempts (a job that takes the app down
+    # would otherwise be retried on every restart). Returns the number requeued.
+    conn = _connect(db_path)
+    try:
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        failed = conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? "
+            "WHERE status = 'running' AND attempts >= max_attempts",
+            ("Interrupted on its last attempt", now)
+        ).rowcount
+        requeued = conn.execute(
+            "UPDATE jobs SET status = 'queued', updated_at = ? WHERE status = 'running'", (now,)
+        ).rowcount
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    if failed:
+        print(f"❌ Failed {failed} interrupted job(s) that were on their last attempt")
+    return requeued
+
+
+def get_job(job_id, db_path=None):
+    conn = _connect(db_path)
+    try:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def list_jobs(status=None, limit=100, db_path=None):
+    conn = _connect(db_path)
+    try:
+        if status:
+            rows = conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit)).fetchall()
+        else:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def process_job(audio_path, meeting_link, segments_path=None):
+    # Runs in a worker process
+    from utils.annotator import transcribe_audio
+    from utils.reportGenerator import save_meeting_reports
+
+    segments = None
+    if segments_path and os.path.exists(segments_path):
+        with open(segments_path, "r") as f:
+            segments = json.load(f)
+
+    transcript_path = transcribe_audio(audio_path, segments=segments)
+    if not transcript_path:
+        raise RuntimeError("Transcription produced no transcript")
+    verdict, final_rating = save_meeting_reports(transcript_path, meeting_link)
+    return transcript_path, verdict, final_rating
+
+
+class JobWorkerPool:
+    # Dispatcher thread that keeps at most max_workers jobs running in a process pool
+    def __init__(self, max_workers=None, poll_interval=2.0, db_path=None):
+        self.max_workers = max_workers or PROCESSING_WORKERS
+        self.poll_interval = poll_interval
+        self.db_path = db_path
+        self._executor = None
+        self._running = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        recovered = recover_jobs(self.db_path)
+        if recovered:
+            print(f"♻️ Requeued {recovered} interrupted job(s)")
+        self._executor = self._new_executor()
+        self._thread = threading.Thread(target=self._dispatch, daemon=True)
+        self._thread.start()
+        return self
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _replace_executor(self, broken):
+        # A worker died (e.g. OOM while loading Whisper) and took the pool with it. Every
+        # in-flight future reports the same broken pool, so only the first one replaces it.
+        with self._lock:
+            if self._executor is not broken or self._stop.is_set():
+                return
+            self._executor = self._new_executor()
+        broken.shutdown(wait=False)
+        print("♻️ A worker process died; restarted the processing pool")
+
+    def notify(self):
+        # Call after enqueue_job to skip the poll wait
+        self._wake.set()
+
+    def stop(self, wait=True):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+
+    def _dispatch(self):
+        while not self._stop.is_set():
+            while self._free_slots() > 0:
+                job = claim_next_job(self.db_path)
+                if job is None:
+                    break
+                print(f"⚙️ Starting job {job['id']} (attempt {job['attempts'] + 1})")
+                executor = self._executor
+                try:
+                    future = executor.submit(process_job, job["audio_path"], job["meeting_link"], job["segments_path"])
+                except BrokenProcessPool:
+                    # The job never started; put it back and retry on a fresh pool
+                    requeue_job(job["id"], self.db_path)
+                    self._replace_executor(executor)
+                    continue
+                with self._lock:
+                    self._running[job["id"]] = future
+                future.add_done_callback(lambda f, job_id=job["id"], executor=executor: self._finished(job_id, f, executor))
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _free_slots(self):
+        with self._lock:
+            return self.max_workers - len(self._running)
+
+    def _finished(self, job_id, future, executor):
+        with self._lock:
+            self._running.pop(job_id, None)
+        try:
+            transcript_path, verdict, final_rating = future.result()
+            complete_job(job_id, transcript_path, verdict, final_rating, self.db_path)
+            print(f"✅ Job {job_id} done. Verdict: {verdict}, Rating: {final_rating}")
+        except BrokenProcessPool as e:
+            # Counts as an attempt: this job may be the one that killed the worker
+            fail_job(job_id, f"Worker process died: {e}", self.db_path)
+            print(f"❌ Job {job_id} failed: worker process died")
+            self._replace_executor(executor)
+        except Exception as e:
+            fail_job(job_id, str(e), self.db_path)
+            print(f"❌ Job {job_id} failed: {e}")
+        self._wake.set()
@@ -0,0 +1,197 @@
+# utils/meetingMonitor.py
+# Detects the end of a Google Meet call from inside the page. A
+# MutationObserver watches the DOM for the "left the meeting" screen and
+# participant-count changes, and Python blocks on that signal through an
+# async script; the old XPath check only runs once per wait as a safety net.
+import os
+import time
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+
+END_TEXTS = ["Return to home screen", "You’ve left the meeting", "You've left the meeting"]
+END_XPATH = '//span[contains(text(), "Return to home screen") or contains(text(), "You’ve left the meeting")]'
+# Consecutive monitor failures (reloads, stale elements, script timeouts) before falling back to polling
+MONITOR_MAX_FAILURES = 5
+MONITOR_MAX_BACKOFF_SECONDS = 30
+PARTICIPANT_SELECTOR = os.getenv("MEET_PARTICIPANT_SELECTOR", '[data-participant-count], button[aria-label*="Show everyone"]')
+
+_INSTALL_SCRIPT = """
+const endTexts = arguments[0];
+const participantSelector = arguments[1];
+if (window.__meetingMonitor) { return; }
+
+const state = {ended: false, endedAt: null, participants: null, version: 0, waiters: []};
+window.__meetingMonitor = state;
+const now = () => performance.timeOrigin + performance.now();
+
+function notify() {
+    state.version += 1;
+    const waiters = state.waiters;
+    state.waiters = [];
+    waiters.forEach(cb => cb());
+}
+
+function hasEndText(text) {
+    return !!text && endTexts.some(t => text.includes(t));
+}
+
+function isVisible(el) {
+    // display:none (including [hidden]) leaves an element without client rects
+    return !!el && el.getClientRects().length > 0;
+}
+
+function showsEndText(node) {
+    // Cheap textContent test first; only walk the subtree when it mentions an end text
+    if (!node || !hasEndText(node.textContent)) { return false; }
+    if (node.nodeType === Node.TEXT_NODE) { return isVisible(node.parentElement); }
+    const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+    for (let n = walker.nextNode(); n; n = walker.nextNode()) {
+        if (hasEndText(n.data) && isVisible(n.parentElement)) { return true; }
+    }
+    return false;
+}
+
+function readParticipants() {
+    const el = document.querySelector(participantSelector);
+    if (!el) { return null; }
+    const source = el.getAttribute("data-participant-count") || el.textContent || el.getAttribute("aria-label") || "";
+    const match = source.match(/\\d+/);
+    return match ? parseInt(match[0], 10) : null;
+}
+
+function check(records) {
+    let changed = false;
+    if (!state.ended) {
+        // Only look at what changed, innerText of the whole page would force layout.
+        // Attribute changes catch an end screen that was rendered hidden and is now shown.
+        const ended = records === null
+            ? showsEndText(document.body)
+            : records.some(r => r.type === "childList"
+                ? Array.from(r.addedNodes).some(showsEndText)
+                : showsEndText(r.target));
+        if (ended) {
+            state.ended = true;
+            state.endedAt = now();
+            changed = true;
+        }
+    }
+    const participants = readParticipants();
+    if (participants !== state.participants) {
+        state.participants = participants;
+        changed = true;
+    }
+    if (changed) { notify(); }
+}
+
+new MutationObserver(records => check(records)).observe(document.documentElement, {
+    childList: true, subtree: true, characterData: true,
+    attributes: true, attributeFilter: ["class", "style", "hidden"]
+});
+check(null);
+"""
+
+_WAIT_SCRIPT = """
+const lastVersion = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const m = window.__meetingMonitor;
+if (!m) { done(null); return; }
+const snapshot = () => ({ended: m.ended, endedAt: m.endedAt, participants: m.participants, version: m.version});
+if (m.version !== lastVersion) { done(snapshot()); return; }
+const timer = setTimeout(() => done(snapshot()), timeoutMs);
+m.waiters.push(() => { clearTimeout(timer); done(snapshot()); });
+"""
+
+
+def install_meeting_monitor(driver, participant_selector=None):
+    driver.execute_script(_INSTALL_SCRIPT, END_TEXTS, participant_selector or PARTICIPANT_SELECTOR)
+
+
+def wait_for_meeting_end(driver, timeout=None, on_participants_change=None, wait_seconds=30, participant_selector=None):
+    # Blocks until the page signals the meeting ended (or timeout seconds pass).
+    # Returns {"ended", "participants", "latency_ms"} where latency_ms is the
+    # time from the DOM change to Python noticing it.
+    deadline = None if timeout is None else time.monotonic() + timeout
+    driver.set_script_timeout(wait_seconds + 10)
+    version = -1
+    participants = None
+    failures = 0
+    checked_at = time.monotonic()
+
+    while deadline is None or time.monotonic() < deadline:
+        wait = wait_seconds if deadline is None else max(0.0, min(wait_seconds, deadline - time.monotonic()))
+        try:
+            if version == -1:
+                # First pass, or the page dropped our script; installing twice is a no-op
+                install_meeting_monitor(driver, participant_selector)
+            state = driver.execute_async_script(_WAIT_SCRIPT, version, int(wait * 1000))
+        except InvalidSessionIdException:
+            # The browser is gone; nothing left to monitor
+            raise
+        except WebDriverException as e:
+            # A reload mid-install, a stale element or a script timeout; back off and re-install
+            failures += 1
+            print(f"⚠️ Meeting monitor interrupted ({failures}/{MONITOR_MAX_FAILURES}):", e.__class__.__name__)
+            if _check_end_screen(driver):
+                return {"ended": True, "participants": participants, "latency_ms": None}
+            if failures >= MONITOR_MAX_FAILURES:
+                print("⚠️ Meeting monitor keeps failing, falling back to polling")
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                return dict(poll_for_meeting_end(driver, timeout=remaining), participants=participants)
+            time.sleep(min(2 ** failures, MONITOR_MAX_BACKOFF_SECONDS))
+            version = -1
+            continue
+        received_at = time.time() * 1000
+        failures = 0
+
+        if state is None:
+            # Usually a navigation that dropped our script; check directly and re-install
+            if _check_end_screen(driver):
+                return {"ended": True, "participants": participants, "latency_ms": None}
+            version = -1
+            continue
+
+        timed_out = state["version"] == version
+        version = state["version"]
+        if state["participants"] != participants:
+            participants = state["participants"]
+            if on_participants_change:
+                on_participants_change(participants)
+        if state["ended"]:
+            # Page clock and our clock are the same machine's wall clock
+            return {"ended": True, "participants": participants, "latency_ms": round(received_at - state["endedAt"], 1)}
+
+        if timed_out or time.monotonic() - checked_at >= wait_seconds:
+            # Safety net, at least every wait_seconds, in case the observer missed the
+            # end screen or was silently dropped
+            checked_at = time.monotonic()
+            if _check_end_screen(driver):
+                return {"ended": True, "participants": participants, "latency_ms": None}
+
+    return {"ended": False, "participants": participants, "latency_ms": None}
+
+
+def _end_screen_present(driver):
+    # Meet may render the end screen hidden ahead of time; only a shown one counts
+    return any(element.is_displayed() for element in driver.find_elements(By.XPATH, END_XPATH))
+
+
+def _check_end_screen(driver):
+    # _end_screen_present that treats a transient WebDriver error as "not yet"
+    try:
+        return _end_screen_present(driver)
+    except InvalidSessionIdException:
+        raise
+    except WebDriverException as e:
+        print("⚠️ Meeting status check failed:", e.__class__.__name__)
+        return False
+
+
+def poll_for_meeting_end(driver, interval=5, timeout=None):
+    # Previous behaviour: look for the end screen every `interval` seconds
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while deadline is None or time.monotonic() < deadline:
+        if _check_end_screen(driver):
+            return {"ended": True, "participants": None, "latency_ms": None}
+        time.sleep(interval)
+    return {"ended": False, "participants": None, "latency_ms": None}
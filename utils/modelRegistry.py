@@ -0,0 +1,159 @@
+# utils/modelRegistry.py
+# Process-wide registry of the heavy models used by the pipeline.
+# Models are loaded lazily on first use, kept warm across interviews and
+# evicted least-recently-used first once the memory budget is exceeded.
+import os
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+HUGGINGFACE_TOKEN = os.getenv("HUGGINGFACE_TOKEN")
+
+# Total memory (in MB) the registry may keep resident before evicting models
+MEMORY_BUDGET_MB = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "6000"))
+# What warm_up() loads by default: the models the meeting pipeline asks for
+WARM_UP_MODEL_NAMES = [name.strip() for name in os.getenv(
+    "WARM_UP_MODEL_NAMES", "whisper-tiny,diarization,embedding,sentiment,summarizer").split(",") if name.strip()]
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+SENTIMENT_MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment"
+SUMMARIZER_MODEL_NAME = "t5-base"
+DIARIZATION_MODEL_NAME = "pyannote/speaker-diarization"
+
+
+def _load_whisper(size):
+    import whisper
+    return whisper.load_model(size)
+
+def _load_diarization():
+    from pyannote.audio import Pipeline
+    return Pipeline.from_pretrained(DIARIZATION_MODEL_NAME, use_auth_token=HUGGINGFACE_TOKEN)
+
+def _load_embedding():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+def _load_sentiment():
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=SENTIMENT_MODEL_NAME)
+
+def _load_summarizer():
+    from transformers import pipeline
+    return pipeline("summarization", model=SUMMARIZER_MODEL_NAME)
+
+
+# name -> (loader, estimated size in MB used when the model can't be measured)
+_specs = {
+    "whisper-tiny": (lambda: _load_whisper("tiny"), 150),
+    "whisper-base": (lambda: _load_whisper("base"), 300),
+    "diarization": (_load_diarization, 100),
+    "embedding": (_load_embedding, 100),
+    "sentiment": (_load_sentiment, 500),
+    "summarizer": (_load_summarizer, 900),
+}
+
+# name -> (model, size in MB), ordered from least to most recently used
+_models = OrderedDict()
+_lock = threading.RLock()
+# name -> lock held while that model is being loaded
+_loading = {}
+
+
+def register_model(name, loader, size_mb):
+    with _lock:
+        _specs[name] = (loader, size_mb)
+        _models.pop(name, None)
+
+
+def _estimate_size_mb(model, default_mb):
+    # transformers pipelines keep the torch module on .model
+    module = getattr(model, "model", model)
+    try:
+        total = sum(p.numel() * p.element_size() for p in module.parameters())
+    except Exception:
+        return default_mb
+    return total / (1024 * 1024) if total else default_mb
+
+
+def _evict_to_budget(keep):
+    used = sum(size for _, size in _models.values())
+    for name in list(_models):
+        if used <= MEMORY_BUDGET_MB:
+            break
+        if name == keep:
+            continue
+        _, size = _models.pop(name)
+        used -= size
+        print(f"♻️ Evicted model '{name}' ({size:.0f} MB) to stay within {MEMORY_BUDGET_MB:.0f} MB")
+
+
+def get_model(name):
+    # _lock only guards the bookkeeping; loads run outside it so a multi-second
+    # load doesn't stall lookups of models that are already resident. A
+    # per-name lock keeps two threads from loading the same model twice.
+    with _lock:
+        if name in _models:
+            _models.move_to_end(name)
+            return _models[name][0]
+        if name not in _specs:
+            raise KeyError(f"Unknown model: {name}")
+        load_lock = _loading.setdefault(name, threading.Lock())
+
+    with load_lock:
+        with _lock:
+            # Loaded by another thread while we waited
+            if name in _models:
+                _models.move_to_end(name)
+                return _models[name][0]
+            spec = _specs[name]
+
+        try:
+            loader, default_mb = spec
+            print(f"📦 Loading model '{name}'...")
+            model = loader()
+            size_mb = _estimate_size_mb(model, default_mb)
+        except Exception:
+            with _lock:
+                _loading.pop(name, None)
+            raise
+
+        with _lock:
+            _loading.pop(name, None)
+            # Don't cache it if register_model replaced the spec during the load
+            if _specs.get(name) is spec:
+                _models[name] = (model, size_mb)
+                _evict_to_budget(keep=name)
+        return model
+
+
+def evict_model(name):
+    with _lock:
+        return _models.pop(name, None) is not None
+
+
+def clear_models():
+    with _lock:
+        _models.clear()
+
+
+def set_memory_budget(budget_mb):
+    global MEMORY_BUDGET_MB
+    with _lock:
+        MEMORY_BUDGET_MB = float(budget_mb)
+        _evict_to_budget(keep=None)
+
+
+def loaded_models():
+    with _lock:
+        return {name: round(size, 1) for name, (_, size) in _models.items()}
+
+
+def warm_up(names=None):
+    # Load models ahead of time so the first interview doesn't pay for it
+    for name in names or WARM_UP_MODEL_NAMES:
+        try:
+            get_model(name)
+        except Exception as e:
+            print(f"⚠️ Could not warm up model '{name}': {e}")
+    return loaded_models()
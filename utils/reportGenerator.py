@@ -1,15 +1,13 @@
 import os
 import re
 import json
+import time
 from datetime import datetime
-from sentence_transformers import SentenceTransformer, util
-from transformers import pipeline
-from textstat import flesch_reading_ease
-
-# Load models
-model = SentenceTransformer("all-MiniLM-L6-v2")
-sentiment_pipeline = pipeline("sentiment-analysis", model="cardiffnlp/twitter-roberta-base-sentiment")
-summarizer = pipeline("summarization", model="t5-base")
+from utils.modelRegistry import get_model
+from utils.embeddings import pairwise_similarities
+from utils.extractiveSummarizer import summarize, summarize_many
+from utils.reportStore import get_report_store
+from utils.reportRenderer import render_text_report
 
 # Map label to human-readable sentiment
 label_map = {
@@ -18,17 +16,28 @@ label_map = {
     "LABEL_2": "Positive"
 }
 
-def get_sentiment_score(response):
-    result = sentiment_pipeline(response)[0]
-    label = result['label']
-    sentiment_label = label_map[label]
+# Number of answers sent through the sentiment model per forward pass
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "16"))
+
+def _sentiment_from_result(result):
+    sentiment_label = label_map[result['label']]
     score = {"Positive": 3, "Neutral": 2, "Negative": 1}[sentiment_label]
     return score, sentiment_label
 
-def get_relevance_score(answer, question):
-    emb1 = model.encode(question, convert_to_tensor=True)
-    emb2 = model.encode(answer, convert_to_tensor=True)
-    relevance = float(util.pytorch_cos_sim(emb1, emb2).item())
+def get_sentiment_score(response):
+    sentiment_pipeline = get_model("sentiment")
+    result = sentiment_pipeline(response)[0]
+    return _sentiment_from_result(result)
+
+def get_sentiment_scores(responses, batch_size=None):
+    # One batched pass over all answers -> [(score, label, confidence), ...]
+    if not responses:
+        return []
+    sentiment_pipeline = get_model("sentiment")
+    outputs = sentiment_pipeline(list(responses), batch_size=batch_size or SENTIMENT_BATCH_SIZE, truncation=True)
+    return [(*_sentiment_from_result(result), result['score']) for result in outputs]
+
+def _bucket_relevance(relevance):
     if relevance > 0.7:
         return 2, relevance
     elif 0.4 <= relevance <= 0.7:
@@ -36,7 +45,18 @@ def get_relevance_score(answer, question):
     else:
         return 0, relevance
 
-def analyse_annotated_transcript(file_path):
+def get_relevance_score(answer, question):
+    relevance = float(pairwise_similarities([question], [answer])[0])
+    return _bucket_relevance(relevance)
+
+def get_relevance_scores(answers, questions):
+    # Two batched encode calls for the whole interview -> [(score, similarity), ...]
+    similarities = pairwise_similarities(questions, answers)
+    return [_bucket_relevance(float(relevance)) for relevance in similarities]
+
+def analyse_annotated_transcript(file_path, timings=None):
+    # timings: optional dict that receives the wall-clock seconds per stage
+    timings = {} if timings is None else timings
     with open(file_path, "r") as f:
         lines = f.readlines()
 
@@ -63,120 +83,106 @@ def analyse_annotated_transcript(file_path):
     sentiment_summary = {"positive": 0, "neutral": 0, "negative": 0}
     sentiment_scores = []
     relevance_scores = []
+    stage_start = time.perf_counter()
+    sentiments = get_sentiment_scores(answers)
+    timings["sentiment"] = time.perf_counter() - stage_start
+
+    stage_start = time.perf_counter()
+    relevances = get_relevance_scores(answers, questions)
+    timings["relevance"] = time.perf_counter() - stage_start
 
     for i in range(len(questions)):
         q = questions[i]
         a = answers[i]
 
-        sentiment_score, sentiment_label = get_sentiment_score(a)
+        sentiment_score, sentiment_label, confidence = sentiments[i]
         sentiment_scores.append(sentiment_score)
         sentiment_summary[sentiment_label.lower()] += 1
 
-        relevance_score, cos_sim = get_relevance_score(a, q)
+        relevance_score, cos_sim = relevances[i]
         relevance_scores.append(relevance_score)
 
         results.append({
             "question": q,
             "answer": a,
             "sentiment": sentiment_label,
+            "sentiment_confidence": confidence,
             "relevance": relevance_score,
             "raw_similarity": cos_sim
         })
 
     return results, sentiment_summary, relevance_scores, sentiment_scores
 
-def extract_pros_and_cons(results):
-    positive_answers = [r["answer"] for r in results if r["sentiment"] == "Positive"]
-    negative_answers = [r["answer"] for r in results if r["sentiment"] == "Negative"]
+# "abstractive" uses the t5 summarizer, "extractive" is a model-free fast path
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "abstractive")
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "8"))
+SUMMARY_MODES = ("abstractive", "extractive")
 
-    pros = []
-    cons = []
+def extract_pros_and_cons(results, mode=None):
+    mode = mode or SUMMARY_MODE
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode: {mode}")
 
-    for ans in positive_answers:
-        summary = summarizer("The candidate said: " + ans, max_length=60, min_length=20, do_sample=False)[0]['summary_text']
-        pros.append(f"• {summary}")
+    positive_answers = [r["answer"] for r in results if r["sentiment"] == "Positive"]
+    negative_answers = [r["answer"] for r in results if r["sentiment"] == "Negative"]
+    answers = positive_answers + negative_answers
+
+    if mode == "extractive":
+        summaries = summarize_many(answers)
+    elif answers:
+        # One batched generation call for every positive and negative answer
+        summarizer = get_model("summarizer")
+        outputs = summarizer(["The candidate said: " + ans for ans in answers], max_length=60, min_length=20, do_sample=False, batch_size=SUMMARY_BATCH_SIZE)
+        summaries = [output['summary_text'] for output in outputs]
+    else:
+        summaries = []
 
-    for ans in negative_answers:
-        summary = summarizer("The candidate said: " + ans, max_length=60, min_length=20, do_sample=False)[0]['summary_text']
-        cons.append(f"• {summary}")
+    pros = [f"• {summary}" for summary in summaries[:len(positive_answers)]]
+    cons = [f"• {summary}" for summary in summaries[len(positive_answers):]]
 
     pros_text = " ".join(pros) if pros else "None"
     cons_text = " ".join(cons) if cons else "None"
 
-    combined_summary = summarizer(f"Pros: {pros_text} Cons: {cons_text}", max_length=100, min_length=30, do_sample=False)[0]['summary_text']
+    if mode == "extractive":
+        combined_summary = summarize(f"Pros: {pros_text} Cons: {cons_text}", max_sentences=3)
+    else:
+        summarizer = get_model("summarizer")
+        combined_summary = summarizer(f"Pros: {pros_text} Cons: {cons_text}", max_length=100, min_length=30, do_sample=False)[0]['summary_text']
     return pros, cons, combined_summary
 
-def evaluate_communication_skills(answers):
-    clarity_scores = []
-    confidence_scores = []
-
-    for ans in answers:
-        clarity = flesch_reading_ease(ans)
-        clarity_scores.append(clarity)
+def evaluate_communication_skills(answers, confidence_scores=None):
+    # Reuse the confidences from the sentiment pass when the caller has them
+    if confidence_scores is None:
+        confidence_scores = [confidence for _, _, confidence in get_sentiment_scores(answers)]
 
-        sentiment_result = sentiment_pipeline(ans)[0]
-        confidence = sentiment_result['score']
-        confidence_scores.append(confidence)
+    from textstat import flesch_reading_ease  # Deferred: loads its dictionaries on import
+    clarity_scores = [flesch_reading_ease(ans) for ans in answers]
 
     avg_clarity = round(sum(clarity_scores) / len(clarity_scores), 2)
     avg_confidence = round(sum(confidence_scores) / len(confidence_scores), 2)
 
     return avg_clarity, avg_confidence
 
-def generate_report(results, sentiment_summary, relevance_scores, sentiment_scores, pros, cons, summary, output_path, avg_clarity, avg_confidence):
-    now = datetime.now()
-    with open(output_path, 'w') as f:
-        f.write("Candidate Report – AI Interview Assistant\n")
-        f.write("="*50 + "\n")
-        f.write(f"📅 Date: {now.strftime('%Y-%m-%d')}\n")
-        f.write(f"🕒 Time: {now.strftime('%H:%M')}\n\n")
-
-        f.write(f"Questions Answered: {len(results)}\n\n")
-        for i, r in enumerate(results, 1):
-            f.write(f"{i}. ❓ {r['question']}\n")
-            f.write(f"   💬 Candidate: {r['answer']}\n")
-            f.write(f"   😊 Sentiment: {r['sentiment']}\n")
-            f.write(f"   🎯 Relevance Score: {relevance_scores[i-1]} (Similarity: {r['raw_similarity']:.2f})\n\n")
-
-        f.write("🗣️ Communication Skill Analysis\n")
-        f.write("-" * 40 + "\n")
-        f.write(f"📖 Clarity Score : {avg_clarity} / 100\n")
-        f.write(f"💪 Confidence Score : {avg_confidence} / 1\n\n")
-
-        f.write("📊 Summary\n")
-        f.write("-"*40 + "\n")
-        f.write(f"✔️ Positive Responses: {sentiment_summary['positive']}\n")
-        f.write(f"✔️ Neutral Responses: {sentiment_summary['neutral']}\n")
-        f.write(f"❌ Negative Responses: {sentiment_summary['negative']}\n\n")
-
-        final_rating = round(
-            sentiment_summary['positive'] * 1.0 +
-            sentiment_summary['neutral'] * 0.6 +
-            sentiment_summary['negative'] * -0.5, 1
-        )
-        final_rating = max(min(final_rating, 10), 0)
-        verdict = "SELECTED" if final_rating >= 6 else "NOT SELECTED"
-
-        f.write(f"\n🏁 Verdict: {verdict}\n")
-        f.write(f"🏆 Final Rating: {final_rating}/10\n\n")
-
-        f.write("💡 Pros\n")
-        f.write(f"{'-'*40}\n")
-        for p in pros:
-            f.write(f"{p}\n")
-
-        f.write("\n⚠️ Cons\n")
-        f.write(f"{'-'*40}\n")
-        for c in cons:
-            f.write(f"{c}\n")
-
-        f.write("\n📝 Summary\n")
-        f.write(f"{'-'*40}\n")
-        f.write(f"{summary}\n")
+def compute_verdict(sentiment_summary):
+    final_rating = round(
+        sentiment_summary['positive'] * 1.0 +
+        sentiment_summary['neutral'] * 0.6 +
+        sentiment_summary['negative'] * -0.5, 1
+    )
+    final_rating = max(min(final_rating, 10), 0)
+    verdict = "SELECTED" if final_rating >= 6 else "NOT SELECTED"
+    return verdict, final_rating
 
+def generate_report(results, sentiment_summary, relevance_scores, sentiment_scores, pros, cons, summary, output_path, avg_clarity, avg_confidence, summary_mode=None):
+    # Writes the text report to a file, rendered from the same structured report the store keeps.
+    # The pipeline itself no longer does this; the API renders text reports on request.
+    verdict, final_rating = compute_verdict(sentiment_summary)
+    report = generate_json_report(results, sentiment_summary, relevance_scores, sentiment_scores, pros, cons, summary, None, avg_clarity, avg_confidence, verdict, final_rating, summary_mode)
+    with open(output_path, 'w') as f:
+        f.write(render_text_report(report["candidate_report"]))
     return verdict, final_rating
 
-def generate_json_report(results, sentiment_summary, relevance_scores, sentiment_scores, pros, cons, summary, output_path, avg_clarity, avg_confidence, verdict, final_rating):
+def generate_json_report(results, sentiment_summary, relevance_scores, sentiment_scores, pros, cons, summary, output_path, avg_clarity, avg_confidence, verdict, final_rating, summary_mode=None):
     now = datetime.now()
     finalVerdict = True if verdict == "SELECTED" else False
 
@@ -195,7 +201,8 @@ def generate_json_report(results, sentiment_summary, relevance_scores, sentiment
                 "neutral_responses": sentiment_summary['neutral'],
                 "negative_responses": sentiment_summary['negative'],
                 "final_rating": final_rating,
-                "summary_text": summary
+                "summary_text": summary,
+                "summary_mode": summary_mode
             },
             "verdict": finalVerdict,
             "pros": pros,
@@ -203,30 +210,41 @@ def generate_json_report(results, sentiment_summary, relevance_scores, sentiment
         }
     }
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'w') as json_file:
-        json.dump(report, json_file, indent=4)
-
-    print(f"\n✅ JSON Report saved at: {output_path}")
-
-def save_meeting_reports(transcript_path, meeting_link):
+    # output_path None: only build the report, e.g. for the report store
+    if output_path:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, 'w') as json_file:
+            json.dump(report, json_file, indent=4)
+        print(f"\n✅ JSON Report saved at: {output_path}")
+    return report
+
+def save_meeting_reports(transcript_path, meeting_link, summary_mode=None, timings=None):
+    # timings: optional dict that receives the wall-clock seconds per stage
+    summary_mode = summary_mode or SUMMARY_MODE
+    timings = {} if timings is None else timings
     os.makedirs('recordings', exist_ok=True)
     meeting_id = re.sub(r'\W+', '_', meeting_link)
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
-    report_folder = "test_reports"
-    os.makedirs(report_folder, exist_ok=True)
+    results, sentiment_summary, relevance_scores, sentiment_scores = analyse_annotated_transcript(transcript_path, timings)
 
-    text_output_path = os.path.join(report_folder, f"{meeting_id}_{timestamp}_report.txt")
-    json_output_path = os.path.join(report_folder, f"{meeting_id}_{timestamp}_report.json")
+    stage_start = time.perf_counter()
+    pros, cons, summary = extract_pros_and_cons(results, mode=summary_mode)
+    timings["summarization"] = time.perf_counter() - stage_start
 
-    results, sentiment_summary, relevance_scores, sentiment_scores = analyse_annotated_transcript(transcript_path)
-    pros, cons, summary = extract_pros_and_cons(results)
-    avg_clarity, avg_confidence = evaluate_communication_skills([r['answer'] for r in results])
+    stage_start = time.perf_counter()
+    avg_clarity, avg_confidence = evaluate_communication_skills(
+        [r['answer'] for r in results],
+        [r['sentiment_confidence'] for r in results]
+    )
+    timings["communication"] = time.perf_counter() - stage_start
 
-    verdict, final_rating = generate_report(results, sentiment_summary, relevance_scores, sentiment_scores, pros, cons, summary, text_output_path, avg_clarity, avg_confidence)
-    generate_json_report(results, sentiment_summary, relevance_scores, sentiment_scores, pros, cons, summary, json_output_path, avg_clarity, avg_confidence, verdict, final_rating)
+    # The structured report is the only thing saved; text reports are rendered from it on request
+    stage_start = time.perf_counter()
+    verdict, final_rating = compute_verdict(sentiment_summary)
+    report = generate_json_report(results, sentiment_summary, relevance_scores, sentiment_scores, pros, cons, summary, None, avg_clarity, avg_confidence, verdict, final_rating, summary_mode)
+    name = get_report_store().add_report(meeting_id, timestamp, report, meeting_link=meeting_link)
+    timings["report_writing"] = time.perf_counter() - stage_start
 
-    print(f"📄 Reports saved to: {report_folder}")
+    print(f"📄 Report saved to the report store as {name}")
     return verdict, final_rating
-
@@ -0,0 +1,91 @@
+# utils/reportRenderer.py
+# Text rendering of a stored candidate_report. The structured report is the
+# only thing the pipeline saves; the prose report is produced from it when
+# someone asks for it, and recent renders are kept in a small LRU cache.
+import io
+import os
+import threading
+from collections import OrderedDict
+
+RENDER_CACHE_SIZE = int(os.getenv("REPORT_RENDER_CACHE_SIZE", "128"))
+
+
+def render_text_report(candidate_report):
+    r = candidate_report
+    results = r.get("results", [])
+    skills = r.get("communication_skill_analysis", {})
+    summary = r.get("summary", {})
+    verdict = "SELECTED" if r.get("verdict") else "NOT SELECTED"
+
+    f = io.StringIO()
+    f.write("Candidate Report – AI Interview Assistant\n")
+    f.write("="*50 + "\n")
+    f.write(f"📅 Date: {r.get('date')}\n")
+    f.write(f"🕒 Time: {r.get('time')}\n\n")
+
+    f.write(f"Questions Answered: {len(results)}\n\n")
+    for i, res in enumerate(results, 1):
+        f.write(f"{i}. ❓ {res['question']}\n")
+        f.write(f"   💬 Candidate: {res['answer']}\n")
+        f.write(f"   😊 Sentiment: {res['sentiment']}\n")
+        f.write(f"   🎯 Relevance Score: {res['relevance']} (Similarity: {res['raw_similarity']:.2f})\n\n")
+
+    f.write("🗣️ Communication Skill Analysis\n")
+    f.write("-" * 40 + "\n")
+    f.write(f"📖 Clarity Score : {skills.get('clarity_score')} / 100\n")
+    f.write(f"💪 Confidence Score : {skills.get('confidence_score')} / 1\n\n")
+
+    f.write("📊 Summary\n")
+    f.write("-"*40 + "\n")
+    f.write(f"✔️ Positive Responses: {summary.get('positive_responses')}\n")
+    f.write(f"✔️ Neutral Responses: {summary.get('neutral_responses')}\n")
+    f.write(f"❌ Negative Responses: {summary.get('negative_responses')}\n\n")
+
+    f.write(f"\n🏁 Verdict: {verdict}\n")
+    f.write(f"🏆 Final Rating: {summary.get('final_rating')}/10\n\n")
+
+    f.write("💡 Pros\n")
+    f.write(f"{'-'*40}\n")
+    for p in r.get("pros", []):
+        f.write(f"{p}\n")
+
+    f.write("\n⚠️ Cons\n")
+    f.write(f"{'-'*40}\n")
+    for c in r.get("cons", []):
+        f.write(f"{c}\n")
+
+    # Reports from before the summary section was added have no summary_text
+    if "summary_text" in summary:
+        f.write("\n📝 Summary\n")
+        f.write(f"{'-'*40}\n")
+        f.write(f"{summary['summary_text']}\n")
+        if summary.get("summary_mode"):
+            f.write(f"\n(Summary mode: {summary['summary_mode']})\n")
+
+    return f.getvalue()
+
+
+class RenderCache:
+    # key -> rendered text; keys must change whenever the report does (e.g. the store's row id and created_at)
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, load_report):
+        # load_report() -> candidate_report dict, only called on a miss; None when
+        # it returns None (the report was removed after the lookup)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        report = load_report()
+        if report is None:
+            return None
+        text = render_text_report(report)
+        with self._lock:
+            self._entries[key] = text
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return text
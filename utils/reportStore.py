@@ -0,0 +1,305 @@
+# utils/reportStore.py
+# SQLite (WAL) store for candidate reports. Each row holds the structured
+# report (text reports are rendered from it on demand) and the columns the API filters and sorts on
+# (meeting id, timestamp, verdict, rating), so reports are looked up by index
+# instead of by globbing and sorting filenames in test_reports/. Rows also
+# keep a slim view (everything but the results bodies) for dashboard views.
+# test_reports/ is imported when the store is empty; `python -m utils.reportStore
+# <folder>` imports any other report folder.
+import os
+import re
+import sys
+import base64
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+REPORT_FOLDER = "test_reports"
+REPORT_STORE_DB = os.getenv("REPORT_STORE_DB", "reports.db")
+IMPORT_BATCH_SIZE = 500
+
+_FILENAME_RE = re.compile(r"^(?P<meeting_id>.+)_(?P<timestamp>\d{8}_\d{6})_report\.json$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    meeting_id TEXT NOT NULL,
+    meeting_link TEXT,
+    timestamp TEXT NOT NULL,
+    verdict INTEGER,
+    final_rating REAL,
+    summary TEXT,
+    slim TEXT,
+    candidate_report TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_meeting ON reports (meeting_id, timestamp);
+CREATE INDEX IF NOT EXISTS reports_timestamp ON reports (timestamp, name);
+CREATE INDEX IF NOT EXISTS reports_rating ON reports (COALESCE(final_rating, -1), name);
+CREATE INDEX IF NOT EXISTS reports_verdict ON reports (verdict, timestamp, name);
+"""
+
+_COLUMNS = ("name", "meeting_id", "meeting_link", "timestamp", "verdict", "final_rating",
+            "summary", "slim", "candidate_report", "created_at")
+
+# sort key -> SQL expression; every one is backed by an index together with name
+SORT_KEYS = {
+    "filename": "name",
+    "timestamp": "timestamp",
+    "final_rating": "COALESCE(final_rating, -1)",
+}
+
+
+def report_name(meeting_id, timestamp):
+    # Same name the report files used to have; /all_reports still calls it "filename"
+    return f"{meeting_id}_{timestamp}_report.json"
+
+
+def encode_cursor(value, name):
+    return base64.urlsafe_b64encode(json.dumps([value, name]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return value, name
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def slim_view(candidate_report):
+    # Everything but the per-question results, which hold the full transcript text
+    return {key: value for key, value in candidate_report.items() if key != "results"}
+
+
+def needs_results(fields):
+    return any(field.split(".", 1)[0] == "results" for field in fields)
+
+
+def project_report(view, fields):
+    # fields like ["verdict", "summary.final_rating"]; missing fields are left out
+    projected = {}
+    for field in fields:
+        parts = field.split(".")
+        value = view
+        try:
+            for part in parts:
+                value = value[part]
+        except (KeyError, TypeError):
+            continue
+        target = projected
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return projected
+
+
+def _report_row(meeting_id, timestamp, report, meeting_link=None, created_at=None, name=None):
+    candidate = report.get("candidate_report", {})
+    summary = candidate.get("summary", {})
+    verdict = candidate.get("verdict")
+    return (
+        name or report_name(meeting_id, timestamp), meeting_id, meeting_link, timestamp,
+        None if verdict is None else int(bool(verdict)),
+        summary.get("final_rating"),
+        json.dumps(summary),
+        json.dumps(slim_view(candidate)),
+        json.dumps(candidate, separators=(",", ":")),
+        created_at or time.time()
+    )
+
+
+class ReportStore:
+    def __init__(self, db_path=REPORT_STORE_DB, import_from=REPORT_FOLDER):
+        # import_from: report folder imported when the store is empty (first start, or
+        # upgrading from the old catalog); None to start empty
+        self.db_path = db_path
+        conn = self._connect()
+        try:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(reports)")}
+            if "mtime" in columns:
+                # The old file catalog was only an index of test_reports/; the import below rebuilds it
+                print("♻️ Replacing the old report catalog with the report store")
+                conn.execute("DROP TABLE reports")
+            conn.executescript(_SCHEMA)
+            empty = conn.execute("SELECT 1 FROM reports LIMIT 1").fetchone() is None
+        finally:
+            conn.close()
+
+        if empty and import_from and os.path.isdir(import_from):
+            imported = self.import_folder(import_from)
+            if imported:
+                print(f"📥 Imported {imported} report(s) from {import_from} into {db_path}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _query(self, sql, params=()):
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def add_report(self, meeting_id, timestamp, report, meeting_link=None):
+        # Returns the name the report is stored under
+        row = _report_row(meeting_id, timestamp, report, meeting_link)
+        self.add_reports([row])
+        return row[0]
+
+    def add_reports(self, rows, replace=True):
+        # Bulk insert of _report_row tuples in one transaction; replace=False keeps existing names.
+        # Replacing updates the row in place, so it keeps its id (and its place in latest()).
+        sql = f"INSERT INTO reports ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+        if replace:
+            sql += " ON CONFLICT (name) DO UPDATE SET " + ", ".join(
+                f"{column} = excluded.{column}" for column in _COLUMNS if column != "name")
+        else:
+            sql += " ON CONFLICT (name) DO NOTHING"
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.executemany(sql, rows).rowcount
+        finally:
+            conn.close()
+
+    def list_reports(self):
+        return self.query_reports()[0]
+
+    def query_reports(self, verdict=None, min_rating=None, max_rating=None, date_from=None, date_to=None,
+                      sort="filename", descending=False, limit=None, cursor=None):
+        # Keyset pagination: returns (reports, next_cursor); next_cursor is None on the last page.
+        # date_from/date_to are datetime.date, matched against the report timestamp.
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        sort_expr = SORT_KEYS[sort]
+        where, params = [], []
+
+        if verdict is not None:
+            where.append("verdict = ?")
+            params.append(int(bool(verdict)))
+        if min_rating is not None:
+            where.append("final_rating >= ?")
+            params.append(min_rating)
+        if max_rating is not None:
+            where.append("final_rating <= ?")
+            params.append(max_rating)
+        if date_from is not None:
+            where.append("timestamp >= ?")
+            params.append(date_from.strftime('%Y%m%d') + "_000000")
+        if date_to is not None:
+            where.append("timestamp <= ?")
+            params.append(date_to.strftime('%Y%m%d') + "_235959")
+        if cursor:
+            value, name = decode_cursor(cursor)
+            where.append(f"({sort_expr}, name) {'<' if descending else '>'} (?, ?)")
+            params.extend([value, name])
+
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT name, summary, verdict, {sort_expr} AS sort_value FROM reports"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {sort_expr} {direction}, name {direction}"
+        if limit is not None:
+            # One extra row tells us whether there is a next page
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+
+        rows = self._query(sql, params)
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["sort_value"], rows[-1]["name"])
+
+        return [{
+            "filename": row["name"],
+            "summary": json.loads(row["summary"]) if row["summary"] else {},
+            "verdict": None if row["verdict"] is None else bool(row["verdict"])
+        } for row in rows], next_cursor
+
+    def latest_for_meeting(self, meeting_id, column="candidate_report"):
+        # {"id", "name", "created_at", column} for the meeting's newest report, or None;
+        # column=None fetches only the metadata
+        return self._latest(column, "WHERE meeting_id = ? ORDER BY timestamp DESC", (meeting_id,))
+
+    def latest(self, column="candidate_report"):
+        # Newest report overall; ids only grow, so the primary key orders them
+        return self._latest(column, "ORDER BY id DESC", ())
+
+    def _latest(self, column, clause, params):
+        if column not in (None, "candidate_report", "slim"):
+            raise ValueError(f"Unknown report column: {column}")
+        columns = "id, name, created_at" + (f", {column}" if column else "")
+        rows = self._query(f"SELECT {columns} FROM reports {clause} LIMIT 1", params)
+        return dict(rows[0]) if rows else None
+
+    def get_candidate_report(self, report_id):
+        rows = self._query("SELECT candidate_report FROM reports WHERE id = ?", (report_id,))
+        return json.loads(rows[0]["candidate_report"]) if rows else None
+
+    def import_folder(self, folder=REPORT_FOLDER, batch_size=IMPORT_BATCH_SIZE):
+        # One-shot import of *_report.json files (the .txt copies are not needed); names
+        # already in the store are kept, so running it twice is harmless
+        imported = 0
+        batch = []
+        with os.scandir(folder) as entries:
+            files = [entry for entry in entries if entry.name.endswith("_report.json") and entry.is_file()]
+            # Oldest first so ids, and with them latest(), follow the order reports were written in
+            for entry in sorted(files, key=lambda e: e.stat().st_mtime):
+                try:
+                    with open(entry.path, "r") as f:
+                        report = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Skipping unreadable report {entry.name}: {e}")
+                    continue
+
+                mtime = entry.stat().st_mtime
+                match = _FILENAME_RE.match(entry.name)
+                if match:
+                    meeting_id, timestamp = match.group("meeting_id"), match.group("timestamp")
+                else:
+                    # Hand-named files keep their name
+                    meeting_id = entry.name[:-len("_report.json")]
+                    timestamp = datetime.fromtimestamp(mtime).strftime('%Y%m%d_%H%M%S')
+
+                batch.append(_report_row(meeting_id, timestamp, report, created_at=mtime, name=entry.name))
+                if len(batch) >= batch_size:
+                    imported += self.add_reports(batch, replace=False)
+                    batch = []
+        if batch:
+            imported += self.add_reports(batch, replace=False)
+        return imported
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_report_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ReportStore()
+        return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import an existing report folder into the report store")
+    parser.add_argument("folder", nargs="?", default=REPORT_FOLDER)
+    parser.add_argument("--db", default=REPORT_STORE_DB)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.folder):
+        sys.exit(f"❌ No such folder: {args.folder}")
+    imported = ReportStore(args.db, import_from=None).import_folder(args.folder)
+    print(f"✅ Imported {imported} report(s) from {args.folder} into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
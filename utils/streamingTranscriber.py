@@ -0,0 +1,110 @@
+# utils/streamingTranscriber.py
+# Transcribes the meeting while it is still being recorded. The recorder
+# hands over fixed-size chunks, a background thread runs Whisper on a
+# rolling window and commits segments once they are clear of the window
+# edge, so only the tail of the audio is left when the call ends.
+import queue
+import threading
+import numpy as np
+from utils.modelRegistry import get_model
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+def to_whisper_audio(chunk, samplerate):
+    # Downmix to mono float32 at 16 kHz, the format Whisper expects
+    audio = np.asarray(chunk, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if samplerate != WHISPER_SAMPLE_RATE:
+        import librosa
+        audio = librosa.resample(audio, orig_sr=samplerate, target_sr=WHISPER_SAMPLE_RATE)
+    return audio.astype(np.float32, copy=False)
+
+
+class StreamingTranscriber:
+    def __init__(self, model_name="whisper-tiny", overlap_seconds=5.0, max_window_seconds=60.0):
+        self.model_name = model_name
+        self.overlap_seconds = overlap_seconds
+        self.max_window_seconds = max_window_seconds
+        self.segments = []
+        self.failed = False
+        self._queue = queue.Queue()
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_offset = 0.0  # stream time (s) of the first sample in the buffer
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def feed(self, chunk, samplerate):
+        # Called from the recorder; never blocks on Whisper
+        self._queue.put((chunk, samplerate))
+
+    def finish(self):
+        # Transcribe whatever is left and return every segment in stream time.
+        # None if a window failed or nothing came out, so the caller runs the
+        # offline Whisper pass on the recording instead.
+        self._queue.put(None)
+        self._thread.join()
+        if self.failed or not self.segments:
+            return None
+        return self.segments
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            final = item is None
+            if self.failed:
+                # The offline pass redoes the whole recording; stop buffering
+                if final:
+                    return
+                continue
+            if not final:
+                self._buffer = np.concatenate([self._buffer, to_whisper_audio(*item)])
+                # Catch up on chunks that queued while Whisper was busy
+                if not self._queue.empty():
+                    continue
+            try:
+                self._transcribe_window(final)
+            except Exception as e:
+                print(f"Error during streaming transcription, falling back to offline transcription: {e}")
+                self.failed = True
+                self._buffer = np.zeros(0, dtype=np.float32)
+            if final:
+                return
+
+    def _transcribe_window(self, final):
+        window_seconds = len(self._buffer) / WHISPER_SAMPLE_RATE
+        if window_seconds == 0 or (not final and window_seconds <= self.overlap_seconds):
+            return
+
+        model = get_model(self.model_name)
+        prompt = " ".join(s["text"].strip() for s in self.segments[-3:]) or None
+        result = model.transcribe(self._buffer, word_timestamps=False, initial_prompt=prompt)
+
+        # Segments ending in the last overlap_seconds may still change once
+        # more audio arrives, so leave them in the buffer for the next pass.
+        # A window that has grown too long is committed whole.
+        commit_all = final or window_seconds > self.max_window_seconds
+        if commit_all:
+            commit_until = float("inf")
+        else:
+            commit_until = window_seconds - self.overlap_seconds
+        committed_end = 0.0
+        for segment in result["segments"]:
+            if segment["end"] > commit_until:
+                break
+            self.segments.append({
+                **segment,
+                "start": segment["start"] + self._buffer_offset,
+                "end": segment["end"] + self._buffer_offset
+            })
+            committed_end = segment["end"]
+
+        if commit_all:
+            # Drop the whole window even if Whisper found nothing in it (silence,
+            # a muted candidate), otherwise every later pass re-transcribes it
+            cut = len(self._buffer)
+        else:
+            cut = min(int(committed_end * WHISPER_SAMPLE_RATE), len(self._buffer))
+        self._buffer = self._buffer[cut:]
+        self._buffer_offset += cut / WHISPER_SAMPLE_RATE
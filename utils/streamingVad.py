@@ -0,0 +1,98 @@
+# utils/streamingVad.py
+# Silence removal for long recordings with bounded memory: the WAV is read
+# in blocks, frame energy is computed per block with NumPy and voiced audio
+# is written out (as 16 kHz mono) as soon as it has been classified.
+import numpy as np
+import soundfile as sf
+
+OUTPUT_SAMPLERATE = 16000
+
+
+def _hop_powers(audio_path, hop_length, block_frames):
+    # Yields (mono samples, mean power of each hop in them) block by block.
+    # Samples that don't fill a whole hop are carried into the next block.
+    carry = np.zeros(0, dtype=np.float32)
+    for block in sf.blocks(audio_path, blocksize=block_frames, dtype='float32', always_2d=True):
+        mono = np.concatenate([carry, block.mean(axis=1)])
+        usable = len(mono) - len(mono) % hop_length
+        carry = mono[usable:]
+        mono = mono[:usable]
+        if usable:
+            yield mono, np.square(mono).reshape(-1, hop_length).mean(axis=1)
+    if len(carry):
+        yield carry, np.array([np.square(carry).mean()])
+
+
+def _frame_powers(hop_powers, hops_per_frame):
+    # Mean power over a frame_length window centred on each hop
+    if hops_per_frame <= 1:
+        return hop_powers
+    return np.convolve(hop_powers, np.ones(hops_per_frame) / hops_per_frame, mode="same")
+
+
+def remove_silence_streaming(audio_path, output_path, threshold_db=-60, frame_length=2048, hop_length=512, block_seconds=30):
+    # threshold_db: frames more than this many dB below the loudest frame are
+    # dropped. frame_length/hop_length are in samples at 16 kHz.
+    # Returns the voiced intervals as [(start_s, end_s), ...] in the original
+    # recording's time, or None on failure.
+    try:
+        sr = sf.info(audio_path).samplerate
+        hop = max(1, int(round(hop_length * sr / OUTPUT_SAMPLERATE)))
+        hops_per_frame = max(1, frame_length // hop_length)
+        block_frames = max(hop, int(block_seconds * sr) // hop * hop)
+
+        # Pass 1: loudest frame, so the threshold is relative like librosa's top_db
+        max_power = 0.0
+        for _, powers in _hop_powers(audio_path, hop, block_frames):
+            max_power = max(max_power, float(_frame_powers(powers, hops_per_frame).max()))
+        min_power = max_power * 10 ** (-abs(threshold_db) / 10)
+
+        resampler = None
+        if sr != OUTPUT_SAMPLERATE:
+            import soxr
+            resampler = soxr.ResampleStream(sr, OUTPUT_SAMPLERATE, 1, dtype='float32')
+
+        # Pass 2: keep voiced hops and record where they came from
+        intervals = []
+        position = 0  # samples read so far
+        with sf.SoundFile(output_path, mode='w', samplerate=OUTPUT_SAMPLERATE, channels=1, subtype='PCM_16') as out:
+            for mono, powers in _hop_powers(audio_path, hop, block_frames):
+                voiced = _frame_powers(powers, hops_per_frame) > min_power if max_power > 0 else np.ones(len(powers), bool)
+                mask = np.repeat(voiced, hop)[:len(mono)]
+
+                # Runs of voiced samples as [start, end) indices within the block
+                edges = np.flatnonzero(np.diff(np.concatenate([[0], mask.astype(np.int8), [0]])))
+                for start, end in zip(edges[::2], edges[1::2]):
+                    begin, finish = float(position + start) / sr, float(position + end) / sr
+                    if intervals and abs(intervals[-1][1] - begin) < 1e-9:
+                        intervals[-1] = (intervals[-1][0], finish)
+                    else:
+                        intervals.append((begin, finish))
+
+                kept = mono[mask]
+                if resampler:
+                    kept = resampler.resample_chunk(kept)
+                if len(kept):
+                    out.write(kept)
+                position += len(mono)
+
+            if resampler:
+                tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+                if len(tail):
+                    out.write(tail)
+    except Exception as e:
+        print(f"Error removing silence: {e}")
+        return None
+    return intervals
+
+
+def to_original_time(times, intervals):
+    # Maps time(s) in the trimmed audio back to the original recording
+    if not intervals:
+        return times
+    bounds = np.asarray(intervals, dtype=np.float64)
+    trimmed_starts = np.concatenate([[0.0], np.cumsum(bounds[:, 1] - bounds[:, 0])[:-1]])
+    t = np.asarray(times, dtype=np.float64)
+    i = np.clip(np.searchsorted(trimmed_starts, t, side="right") - 1, 0, len(bounds) - 1)
+    original = bounds[i, 0] + (t - trimmed_starts[i])
+    return float(original) if original.ndim == 0 else original
@@ -1,13 +1,12 @@
 # utils/transcriber.py
-import whisper
 import os
-
-model = whisper.load_model("base")  # Load once and reuse
+from utils.modelRegistry import get_model
 
 def transcribe_audio(audio_path, output_dir="transcripts"):
     os.makedirs(output_dir, exist_ok=True)
 
     print(f"🔍 Transcribing audio: {audio_path}")
+    model = get_model("whisper-base")  # Shared, kept warm by the registry
     result = model.transcribe(audio_path)
 
     text = result["text"]